@@ -58,6 +58,11 @@ def run_migrations_online() -> None:
         )
 
         with context.begin_transaction():
+            if connection.dialect.name == "postgresql":
+                # Scoped to the migration transaction: skip the WAL flush wait
+                # on commit and give index builds more sort memory
+                connection.exec_driver_sql("SET LOCAL synchronous_commit = off")
+                connection.exec_driver_sql("SET LOCAL maintenance_work_mem = '512MB'")
             context.run_migrations()
 
 
@@ -0,0 +1,48 @@
+"""Add indexes on user_id foreign keys
+
+Revision ID: 004_add_foreign_key_indexes
+Revises: 13b649cac2a6
+Create Date: 2026-10-15 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '004_add_foreign_key_indexes'
+down_revision = '13b649cac2a6'
+branch_labels = None
+depends_on = None
+
+
+USER_ID_TABLES = (
+    'habits',
+    'moods',
+    'goals',
+    'notes',
+    'reminders',
+    'analytics',
+    'assessments',
+    'personal_inspirations',
+)
+
+
+def upgrade() -> None:
+    # Postgres does not index foreign keys automatically
+    for table in USER_ID_TABLES:
+        op.create_index(op.f(f'ix_{table}_user_id'), table, ['user_id'])
+
+    # Time-window scans over reminders and moods
+    op.create_index('ix_reminders_user_id_trigger_time', 'reminders', ['user_id', 'trigger_time'])
+    op.create_index('ix_reminders_status_trigger_time', 'reminders', ['status', 'trigger_time'])
+    op.create_index('ix_moods_user_id_timestamp', 'moods', ['user_id', 'timestamp'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_moods_user_id_timestamp', table_name='moods')
+    op.drop_index('ix_reminders_status_trigger_time', table_name='reminders')
+    op.drop_index('ix_reminders_user_id_trigger_time', table_name='reminders')
+
+    for table in reversed(USER_ID_TABLES):
+        op.drop_index(op.f(f'ix_{table}_user_id'), table_name=table)
@@ -0,0 +1,40 @@
+"""Add composite indexes for per-user list ordering
+
+Revision ID: 005_add_list_ordering_indexes
+Revises: 004_add_foreign_key_indexes
+Create Date: 2026-10-15 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '005_add_list_ordering_indexes'
+down_revision = '004_add_foreign_key_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Mood time windows only read mood_type/intensity, so INCLUDE them to
+    # answer analytics from the index alone
+    op.create_index(
+        'ix_moods_user_id_created_at',
+        'moods',
+        ['user_id', 'created_at'],
+        postgresql_include=['mood_type', 'intensity'],
+    )
+    # Ordered list endpoints (b-tree indexes are scanned backwards for DESC)
+    op.create_index('ix_notes_user_id_updated_at', 'notes', ['user_id', 'updated_at'])
+    op.create_index(
+        'ix_personal_inspirations_user_id_created_at',
+        'personal_inspirations',
+        ['user_id', 'created_at'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_personal_inspirations_user_id_created_at', table_name='personal_inspirations')
+    op.drop_index('ix_notes_user_id_updated_at', table_name='notes')
+    op.drop_index('ix_moods_user_id_created_at', table_name='moods')
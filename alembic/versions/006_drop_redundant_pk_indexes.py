@@ -0,0 +1,40 @@
+"""Drop secondary indexes that duplicate primary keys
+
+Revision ID: 006_drop_redundant_pk_indexes
+Revises: 005_add_list_ordering_indexes
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '006_drop_redundant_pk_indexes'
+down_revision = '005_add_list_ordering_indexes'
+branch_labels = None
+depends_on = None
+
+
+TABLES = (
+    'users',
+    'habits',
+    'moods',
+    'goals',
+    'notes',
+    'reminders',
+    'analytics',
+    'assessments',
+    'personal_inspirations',
+)
+
+
+def upgrade() -> None:
+    # Every primary key already has its own unique b-tree index
+    for table in TABLES:
+        op.drop_index(op.f(f'ix_{table}_id'), table_name=table)
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.create_index(op.f(f'ix_{table}_id'), table, ['id'])
@@ -0,0 +1,30 @@
+"""Add partial index over pending reminders
+
+Revision ID: 007_add_pending_reminders_index
+Revises: 006_drop_redundant_pk_indexes
+Create Date: 2026-10-15 10:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '007_add_pending_reminders_index'
+down_revision = '006_drop_redundant_pk_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Only pending, active reminders are ever scanned by trigger time
+    op.create_index(
+        'ix_reminders_pending_time',
+        'reminders',
+        ['trigger_time'],
+        postgresql_where=sa.text("status = 'pending' AND is_active = true"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reminders_pending_time', table_name='reminders')
@@ -0,0 +1,27 @@
+"""Replace habits user_id index with (user_id, is_active)
+
+Revision ID: 008_add_habits_active_index
+Revises: 007_add_pending_reminders_index
+Create Date: 2026-10-15 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '008_add_habits_active_index'
+down_revision = '007_add_pending_reminders_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The composite index also serves plain user_id lookups
+    op.create_index('ix_habits_user_id_is_active', 'habits', ['user_id', 'is_active'])
+    op.drop_index(op.f('ix_habits_user_id'), table_name='habits')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_habits_user_id'), 'habits', ['user_id'])
+    op.drop_index('ix_habits_user_id_is_active', table_name='habits')
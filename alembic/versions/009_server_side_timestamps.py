@@ -0,0 +1,48 @@
+"""Default timestamp columns to the database's UTC clock
+
+Revision ID: 009_server_side_timestamps
+Revises: 008_add_habits_active_index
+Create Date: 2026-10-15 11:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '009_server_side_timestamps'
+down_revision = '008_add_habits_active_index'
+branch_labels = None
+depends_on = None
+
+
+UTC_NOW = sa.text("TIMEZONE('utc', CURRENT_TIMESTAMP)")
+
+TIMESTAMP_COLUMNS = (
+    ('users', 'created_at'),
+    ('users', 'updated_at'),
+    ('habits', 'created_at'),
+    ('habits', 'updated_at'),
+    ('moods', 'timestamp'),
+    ('moods', 'created_at'),
+    ('goals', 'created_at'),
+    ('goals', 'updated_at'),
+    ('notes', 'created_at'),
+    ('notes', 'updated_at'),
+    ('reminders', 'created_at'),
+    ('reminders', 'updated_at'),
+    ('analytics', 'created_at'),
+    ('assessments', 'created_at'),
+    ('assessments', 'updated_at'),
+    ('personal_inspirations', 'created_at'),
+)
+
+
+def upgrade() -> None:
+    for table, column in TIMESTAMP_COLUMNS:
+        op.alter_column(table, column, existing_type=sa.DateTime(), server_default=UTC_NOW)
+
+
+def downgrade() -> None:
+    for table, column in reversed(TIMESTAMP_COLUMNS):
+        op.alter_column(table, column, existing_type=sa.DateTime(), server_default=None)
@@ -0,0 +1,33 @@
+"""Replace goals/assessments user_id indexes with (user_id, id)
+
+Revision ID: 010_add_keyset_pagination_indexes
+Revises: 009_server_side_timestamps
+Create Date: 2026-10-15 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '010_add_keyset_pagination_indexes'
+down_revision = '009_server_side_timestamps'
+branch_labels = None
+depends_on = None
+
+
+TABLES = ('goals', 'assessments')
+
+
+def upgrade() -> None:
+    # Keyset pages seek on (user_id, id < cursor) ordered by id DESC; the
+    # composite index serves that directly and also covers user_id lookups
+    for table in TABLES:
+        op.create_index(f'ix_{table}_user_id_id', table, ['user_id', 'id'])
+        op.drop_index(op.f(f'ix_{table}_user_id'), table_name=table)
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.create_index(op.f(f'ix_{table}_user_id'), table, ['user_id'])
+        op.drop_index(f'ix_{table}_user_id_id', table_name=table)
@@ -0,0 +1,34 @@
+"""Drop user_id indexes made redundant by (user_id, ...) composites
+
+Revision ID: 011_drop_redundant_user_id_indexes
+Revises: 010_add_keyset_pagination_indexes
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '011_drop_redundant_user_id_indexes'
+down_revision = '010_add_keyset_pagination_indexes'
+branch_labels = None
+depends_on = None
+
+
+# Each table already has a composite index leading with user_id:
+# moods (user_id, timestamp), notes (user_id, updated_at),
+# reminders (user_id, trigger_time), personal_inspirations (user_id, created_at)
+TABLES = ('moods', 'notes', 'reminders', 'personal_inspirations')
+
+
+def upgrade() -> None:
+    # The composites also serve plain user_id lookups, so the single-column
+    # indexes only add write cost
+    for table in TABLES:
+        op.drop_index(op.f(f'ix_{table}_user_id'), table_name=table)
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.create_index(op.f(f'ix_{table}_user_id'), table, ['user_id'])
@@ -0,0 +1,31 @@
+from threading import Lock
+from typing import Any, Hashable, Optional
+from cachetools import TTLCache
+
+
+class ResponseCache:
+    """Thread-safe, process-local TTL cache keyed by ``(user_id, ...)`` tuples.
+
+    The API runs as a single uvicorn process, so entries stay coherent as long
+    as writes ``invalidate`` the affected user's keys.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for a key, or None."""
+        with self._lock:
+            return self._cache.get(key)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value under a key."""
+        with self._lock:
+            self._cache[key] = value
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """Drop the given keys; callers know a user's keys, so nothing is scanned."""
+        with self._lock:
+            for key in keys:
+                self._cache.pop(key, None)
@@ -1,12 +1,12 @@
-from pydantic_settings import BaseSettings
-from typing import Optional
-from dotenv import load_dotenv
-import os
+from functools import lru_cache
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
-load_dotenv()  # Load environment variables from .env file
 
 class Settings(BaseSettings):
-    """Application configuration settings."""
+    """Application configuration settings.
+
+    Values are read from the environment (and ``.env``) by pydantic-settings.
+    """
     
     # App Configuration
     APP_NAME: str = "Mindful Progress API"
@@ -15,22 +15,40 @@ class Settings(BaseSettings):
     DEBUG: bool = True
     
     # Database Configuration
-    # Default matches docker-compose service credentials when running with Docker
-    DATABASE_URL: str = os.getenv("DATABASE_URL")
+    DATABASE_URL: str
+    SQL_LOG_SAMPLE_RATE: float = 0.0  # fraction of statements to log, e.g. 0.001
+    SQL_SLOW_QUERY_MS: int = 100  # log statements slower than this; 0 disables
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    
+    # CORS Configuration (comma-separated lists, "*" allows any)
+    ALLOWED_ORIGINS: str = "*"
+    ALLOWED_HEADERS: str = "*"  # request headers clients may send
     
     # JWT Configuration
-    SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-change-this-in-production")
-    ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30)
+    SECRET_KEY: str = "your-secret-key-change-this-in-production"
+    ALGORITHM: str = "HS256"
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    BCRYPT_ROUNDS: int = 10  # tune on the target host; each +1 doubles hash time
     
     # Google OAuth Configuration
-    GOOGLE_CLIENT_ID: str = os.getenv("GOOGLE_CLIENT_ID", "314916917003-4s562n3a51bhcpt6sdov0qqkjov4ue71.apps.googleusercontent.com")
-    GOOGLE_CLIENT_SECRET: str = os.getenv("GOOGLE_CLIENT_SECRET", "")
-    GOOGLE_PROJECT_ID: str = os.getenv("GOOGLE_PROJECT_ID", "mindful-475220")
+    GOOGLE_CLIENT_ID: str = "314916917003-4s562n3a51bhcpt6sdov0qqkjov4ue71.apps.googleusercontent.com"
+    GOOGLE_CLIENT_SECRET: str = ""
+    GOOGLE_PROJECT_ID: str = "mindful-475220"
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=True,
+        extra="ignore",
+    )
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings instance."""
+    return Settings()
 
 
-settings = Settings()
+settings = get_settings()
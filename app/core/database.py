@@ -1,30 +1,98 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
-from sqlalchemy.pool import NullPool
+import logging
+import random
+import time
+from sqlalchemy import DateTime, create_engine, event
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.sql.functions import FunctionElement
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 # Create database engine
+# Connections are pooled and pre-pinged so requests reuse an open connection
+# instead of paying a connect handshake each time. LIFO checkout keeps reusing
+# the most recently returned (warm) connection during quiet periods rather
+# than cycling through every pooled one. SQLAlchemy's per-engine compiled
+# cache (query_cache_size) keeps statement compilation warm.
 engine = create_engine(
     settings.DATABASE_URL,
-    poolclass=NullPool,
-    echo=settings.DEBUG,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_pre_ping=True,
+    pool_use_lifo=True,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    query_cache_size=1200,
+)
+
+# Statement logging goes through the standard "sqlalchemy.engine" logger
+# rather than echo, which formats and prints every statement to stderr.
+logging.getLogger("sqlalchemy.engine").setLevel(
+    logging.INFO if settings.DEBUG else logging.WARNING
 )
 
+if settings.SQL_LOG_SAMPLE_RATE > 0:
+    @event.listens_for(engine, "after_cursor_execute")
+    def _log_sampled_statement(conn, cursor, statement, parameters, context, executemany):
+        """Log a random sample of executed statements for profiling."""
+        if random.random() < settings.SQL_LOG_SAMPLE_RATE:
+            logger.info("Sampled SQL: %s", statement)
+
+if settings.SQL_SLOW_QUERY_MS > 0:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_statement_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _log_slow_statement(conn, cursor, statement, parameters, context, executemany):
+        """Log statements that took longer than SQL_SLOW_QUERY_MS."""
+        elapsed_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+        if elapsed_ms >= settings.SQL_SLOW_QUERY_MS:
+            logger.warning("Slow SQL (%.0f ms): %s", elapsed_ms, statement)
+
+    @event.listens_for(engine, "handle_error")
+    def _drop_statement_timer(exception_context):
+        # A failed statement never reaches after_cursor_execute
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start_time"):
+            conn.info["query_start_time"].pop()
+
 # Create session factory
+# expire_on_commit=False keeps loaded attributes (e.g. the current user) valid
+# after a commit instead of reloading them on the next access.
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
+    expire_on_commit=False,
     bind=engine,
 )
 
-# Base class for all models
-Base = declarative_base()
+
+class Base(DeclarativeBase):
+    """Base class for all models."""
+    # Fetch server-generated columns (timestamps) via RETURNING on INSERT and
+    # UPDATE instead of expiring them and reloading on next access
+    __mapper_args__ = {"eager_defaults": True}
+
+
+class utcnow(FunctionElement):
+    """Current UTC time as a naive timestamp, evaluated by the database."""
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _default_utcnow(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "postgresql")
+def _pg_utcnow(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
 
 
 def get_db():
     """Dependency injection function for database sessions."""
-    db = SessionLocal()
-    try:
+    with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -0,0 +1,21 @@
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.schedulers.background import BackgroundScheduler
+
+# Process-local scheduler for delayed jobs such as timer notifications. Jobs
+# run on the scheduler's own worker threads, never on the event loop.
+scheduler = BackgroundScheduler()
+
+
+def start_scheduler() -> None:
+    """Configure and start the scheduler for one application lifespan.
+
+    A shut-down worker pool can't be reused, so each start gets a fresh one.
+    Jobs that fire late (e.g. after the process was paused) still run within
+    the grace period.
+    """
+    scheduler.configure(
+        timezone="UTC",
+        executors={"default": ThreadPoolExecutor(max_workers=10)},
+        job_defaults={"misfire_grace_time": 60, "coalesce": True},
+    )
+    scheduler.start()
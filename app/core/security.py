@@ -1,6 +1,10 @@
 from datetime import datetime, timedelta, timezone
-from typing import Optional
-from jose import JWTError, jwt
+from threading import Lock
+from typing import Optional, Tuple
+import time
+from cachetools import TTLCache
+import jwt
+from jwt import InvalidTokenError as JWTError
 from passlib.context import CryptContext
 from pydantic import ValidationError
 from app.core.config import settings
@@ -11,7 +15,22 @@ from app.core.database import get_db
 from app.models.user import User
 
 # Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# The default cost of 10 keeps login latency low; hashes made at any other
+# cost (e.g. the old 12) still verify since the cost is stored in each hash.
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+
+# Verified against when there is no real hash, so unknown emails and
+# password-less OAuth accounts cost the same bcrypt round as a real login
+_DUMMY_HASH = pwd_context.hash("dummy-password")
+
+
+# Default access token lifetime
+_DEFAULT_EXPIRY = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+ACCESS_TOKEN_EXPIRES_IN = int(_DEFAULT_EXPIRY.total_seconds())  # seconds, as reported to clients
+
+# JWT key material and allowed algorithms, resolved once
+_JWT_KEY = settings.SECRET_KEY.encode("utf-8")
+_JWT_ALGORITHMS = [settings.ALGORITHM]
 
 
 def hash_password(password: str) -> str:
@@ -24,22 +43,30 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: Optional[str]) -> Tuple[bool, Optional[str]]:
+    """Verify a password and return a replacement hash if the stored one is outdated.
+
+    Hashes made at a different bcrypt cost (e.g. the old cost 12) are re-hashed
+    at the current cost so later logins are cheaper. A missing hash still runs
+    a full verify against a dummy hash and then fails.
+    """
+    if hashed_password is None:
+        pwd_context.verify(plain_password, _DUMMY_HASH)
+        return False, None
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
     
-    if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
-    else:
-        expire = datetime.now(timezone.utc) + timedelta(
-            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-        )
+    expire = datetime.now(timezone.utc) + (expires_delta or _DEFAULT_EXPIRY)
     
     to_encode.update({"exp": expire})
     
     encoded_jwt = jwt.encode(
         to_encode,
-        settings.SECRET_KEY,
+        _JWT_KEY,
         algorithm=settings.ALGORITHM,
     )
     
@@ -51,8 +78,8 @@ def verify_token(token: str) -> Optional[dict]:
     try:
         payload = jwt.decode(
             token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM],
+            _JWT_KEY,
+            algorithms=_JWT_ALGORITHMS,
         )
         return payload
     except (JWTError, ValidationError):
@@ -69,6 +96,30 @@ def decode_token(token: str) -> Optional[str]:
     return None
 
 
+# Recently verified tokens -> (user_id, exp) so repeat requests skip the
+# signature check. Entries are never trusted past the token's own expiry.
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+_token_cache_lock = Lock()
+
+
+def _resolve_user_id(token: str) -> Optional[int]:
+    """Return the user ID for a token, reusing recent verifications."""
+    now = time.time()
+    with _token_cache_lock:
+        cached = _token_cache.get(token)
+    if cached and cached[1] > now:
+        return cached[0]
+
+    payload = verify_token(token)
+    if not payload or not payload.get("sub"):
+        return None
+
+    user_id = int(payload["sub"])
+    with _token_cache_lock:
+        _token_cache[token] = (user_id, payload.get("exp", now))
+    return user_id
+
+
 # FastAPI security dependency to extract bearer token from Authorization header
 bearer_scheme = HTTPBearer(auto_error=False)
 
@@ -84,10 +135,14 @@ def get_token_from_header(credentials: HTTPAuthorizationCredentials = Depends(be
     return credentials.credentials
 
 
-def get_current_user(token: Optional[str] = Depends(get_token_from_header), db: Session = Depends(get_db)) -> User:
-    """Dependency that returns the current User instance or raises 401/404.
+def get_current_user_id(token: Optional[str] = Depends(get_token_from_header)) -> int:
+    """Dependency that returns the authenticated user's ID or raises 401.
 
-    Use this in routes as: current_user: User = Depends(get_current_user)
+    Use this in routes as: current_user_id: int = Depends(get_current_user_id)
+
+    Nothing is loaded from the database. Meant for writes whose statements are
+    already scoped by ``user_id``: a token for a deleted user matches no rows
+    and gets the route's usual 404.
     """
     if not token:
         raise HTTPException(
@@ -95,14 +150,25 @@ def get_current_user(token: Optional[str] = Depends(get_token_from_header), db:
             detail="Authorization token required",
         )
 
-    user_id = decode_token(token)
+    user_id = _resolve_user_id(token)
     if not user_id:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
         )
+    return user_id
 
-    user = db.query(User).filter(User.id == int(user_id)).first()
+
+def get_current_user(user_id: int = Depends(get_current_user_id), db: Session = Depends(get_db)) -> User:
+    """Dependency that returns the current User instance or raises 401/404.
+
+    Use this in routes as: current_user: User = Depends(get_current_user)
+
+    FastAPI caches dependencies per request, so a route that also declares
+    ``db: Session = Depends(get_db)`` gets this same session (and pooled
+    connection); the user is loaded once and stays in its identity map.
+    """
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,8 +1,12 @@
+from contextlib import asynccontextmanager
+from anyio import to_thread
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.openapi.utils import get_openapi
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.core.database import engine, Base
+from app.core.scheduler import scheduler, start_scheduler
 from app.routes import (
     auth_routes,
     habit_routes,
@@ -16,8 +20,28 @@ from app.routes import (
     personal_inspiration_routes,
 )
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup/shutdown hooks.
+
+    Alembic owns the schema outside development, so tables are only created
+    here for local runs. The delayed-job scheduler runs for the app's lifetime.
+    """
+    # Sync routes and password hashing run in anyio's threadpool; size it to
+    # the database pool (plus a few threads for non-DB work) so it can use
+    # every connection without queueing requests behind idle ones
+    to_thread.current_default_thread_limiter().total_tokens = max(
+        40, settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW + 4
+    )
+
+    if settings.ENVIRONMENT == "development":
+        Base.metadata.create_all(bind=engine)
+
+    start_scheduler()
+    yield
+    scheduler.shutdown(wait=False)
+
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -26,9 +50,18 @@ app = FastAPI(
     description="Backend API for Mindful Progress App",
     docs_url="/docs",
     openapi_url="/openapi.json",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
+# Paths documented without the Bearer requirement. "/" and "/health" are
+# matched exactly; as prefixes they would match every route.
+PUBLIC_PATHS = frozenset({"/", "/health"})
+PUBLIC_PREFIXES = ("/auth", "/openapi.json", "/docs")
+HTTP_METHODS = frozenset({"get", "post", "put", "patch", "delete", "head", "options", "trace"})
+
+
 def custom_openapi():
     """Create a custom OpenAPI schema that includes a global Bearer auth scheme.
 
@@ -59,13 +92,11 @@ def custom_openapi():
     openapi_schema.setdefault("security", [{"BearerAuth": []}])
 
     # Exclude some public paths from requiring auth (e.g., /auth/*, /, /health, /openapi.json)
-    public_prefixes = ("/auth", "/openapi.json", "/docs", "/", "/health")
     for path, path_item in openapi_schema.get("paths", {}).items():
-        if any(path.startswith(p) for p in public_prefixes):
-            # remove security requirement for all methods on this path
-            for method in path_item.keys():
-                if isinstance(path_item[method], dict) and "security" in path_item[method]:
-                    path_item[method].pop("security", None)
+        if path in PUBLIC_PATHS or path.startswith(PUBLIC_PREFIXES):
+            # an empty requirement list overrides the global BearerAuth
+            for method in HTTP_METHODS & path_item.keys():
+                path_item[method]["security"] = []
 
     app.openapi_schema = openapi_schema
     return app.openapi_schema
@@ -77,10 +108,11 @@ app.openapi = custom_openapi
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Update this with specific domains in production
+    allow_origins=[origin.strip() for origin in settings.ALLOWED_ORIGINS.split(",") if origin.strip()],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+    allow_headers=[header.strip() for header in settings.ALLOWED_HEADERS.split(",") if header.strip()],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
 
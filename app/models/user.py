@@ -1,22 +1,23 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Enum, Float, ForeignKey, JSON
-from sqlalchemy.orm import relationship
-from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Enum, Float, ForeignKey, JSON, Index, text
+from sqlalchemy.orm import relationship, deferred
 import enum
-from app.core.database import Base
+from app.core.database import Base, utcnow
 
 
 class User(Base):
     """User model for authentication and profile management."""
     __tablename__ = "users"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String(255), nullable=False)
     email = Column(String(255), unique=True, nullable=False, index=True)
     password_hash = Column(String(255), nullable=True)  # Nullable for OAuth users
     gender = Column(String(50), nullable=True)
     motivations = Column(Text, nullable=True)
     language = Column(String(10), default="en")
-    picture = Column(Text, nullable=True)  # Store Base64 encoded images
+    # Base64 image, deferred so the per-request user lookup (get_current_user)
+    # and login don't pull it; loaded on first access by profile responses
+    picture = deferred(Column(Text, nullable=True))
     role = Column(String(20), default="user")  # 'user' or 'admin'
     is_active = Column(Boolean, default=True)
     user_goals = Column(JSON, nullable=True, default=list)  # List of user goals stored as JSON
@@ -25,10 +26,12 @@ class User(Base):
     oauth_provider = Column(String(50), nullable=True)  # 'google', 'facebook', etc.
     oauth_id = Column(String(255), nullable=True, unique=True, index=True)  # Provider's user ID
     
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow(), nullable=False)
+    updated_at = Column(DateTime, server_default=utcnow(), onupdate=utcnow())
     
     # Relationships
+    # The children's `user` back-references are lazy="raise_on_sql": they
+    # resolve from the identity map, but never issue a per-row SELECT.
     habits = relationship("Habit", back_populates="user", cascade="all, delete-orphan")
     moods = relationship("Mood", back_populates="user", cascade="all, delete-orphan")
     goals = relationship("Goal", back_populates="user", cascade="all, delete-orphan")
@@ -42,8 +45,11 @@ class User(Base):
 class Habit(Base):
     """Habit model for tracking user habits."""
     __tablename__ = "habits"
+    __table_args__ = (
+        Index("ix_habits_user_id_is_active", "user_id", "is_active"),
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     title = Column(String(255), nullable=False)
     category = Column(String(100), nullable=False)
@@ -52,11 +58,11 @@ class Habit(Base):
     streak_count = Column(Integer, default=0)
     success_rate = Column(Float, default=0.0)
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow(), nullable=False)
+    updated_at = Column(DateTime, server_default=utcnow(), onupdate=utcnow())
     
     # Relationships
-    user = relationship("User", back_populates="habits")
+    user = relationship("User", back_populates="habits", lazy="raise_on_sql")
 
 
 class MoodType(str, enum.Enum):
@@ -72,24 +78,36 @@ class MoodType(str, enum.Enum):
 class Mood(Base):
     """Mood entry model for tracking user emotions."""
     __tablename__ = "moods"
-    
-    id = Column(Integer, primary_key=True, index=True)
+    __table_args__ = (
+        Index("ix_moods_user_id_timestamp", "user_id", "timestamp"),
+        Index(
+            "ix_moods_user_id_created_at",
+            "user_id",
+            "created_at",
+            postgresql_include=["mood_type", "intensity"],
+        ),
+    )
+    
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     mood_type = Column(String(50), nullable=False)  # excellent, good, neutral, sad, anxious, angry
     intensity = Column(Integer, nullable=True)  # 1-10 scale
     note = Column(Text, nullable=True)
-    timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    timestamp = Column(DateTime, server_default=utcnow(), nullable=False)
+    created_at = Column(DateTime, server_default=utcnow(), nullable=False)
     
     # Relationships
-    user = relationship("User", back_populates="moods")
+    user = relationship("User", back_populates="moods", lazy="raise_on_sql")
 
 
 class Goal(Base):
     """Goal model for tracking user objectives."""
     __tablename__ = "goals"
+    __table_args__ = (
+        Index("ix_goals_user_id_id", "user_id", "id"),
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     title = Column(String(255), nullable=False)
     goal_type = Column(String(100), nullable=False)  # fitness, mental, learning, etc.
@@ -97,27 +115,30 @@ class Goal(Base):
     timeframe = Column(String(100), nullable=False)  # short-term, long-term, etc.
     completion_percentage = Column(Float, default=0.0)
     is_completed = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow(), nullable=False)
+    updated_at = Column(DateTime, server_default=utcnow(), onupdate=utcnow())
     
     # Relationships
-    user = relationship("User", back_populates="goals")
+    user = relationship("User", back_populates="goals", lazy="raise_on_sql")
 
 
 class Note(Base):
     """Note model for storing user notes."""
     __tablename__ = "notes"
+    __table_args__ = (
+        Index("ix_notes_user_id_updated_at", "user_id", "updated_at"),
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     title = Column(String(255), nullable=False)
     content = Column(Text, nullable=False)
     is_pinned = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow(), nullable=False)
+    updated_at = Column(DateTime, server_default=utcnow(), onupdate=utcnow())
     
     # Relationships
-    user = relationship("User", back_populates="notes")
+    user = relationship("User", back_populates="notes", lazy="raise_on_sql")
 
 
 class ReminderType(str, enum.Enum):
@@ -133,8 +154,17 @@ class ReminderType(str, enum.Enum):
 class Reminder(Base):
     """Reminder model for scheduling notifications."""
     __tablename__ = "reminders"
-    
-    id = Column(Integer, primary_key=True, index=True)
+    __table_args__ = (
+        Index("ix_reminders_user_id_trigger_time", "user_id", "trigger_time"),
+        Index("ix_reminders_status_trigger_time", "status", "trigger_time"),
+        Index(
+            "ix_reminders_pending_time",
+            "trigger_time",
+            postgresql_where=text("status = 'pending' AND is_active = true"),
+        ),
+    )
+    
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     reminder_type = Column(String(50), nullable=False)  # habit, meditation, exercise, mindful_eating, break, custom
     title = Column(String(255), nullable=False)
@@ -143,57 +173,63 @@ class Reminder(Base):
     frequency = Column(String(50), nullable=True)  # one-time, daily, weekly, etc.
     status = Column(String(20), default="pending")  # pending, triggered, completed, cancelled
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow(), nullable=False)
+    updated_at = Column(DateTime, server_default=utcnow(), onupdate=utcnow())
     
     # Relationships
-    user = relationship("User", back_populates="reminders")
+    user = relationship("User", back_populates="reminders", lazy="raise_on_sql")
 
 
 class Analytics(Base):
     """Analytics model for storing user insights and progress."""
     __tablename__ = "analytics"
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     summary = Column(Text, nullable=False)
     score = Column(Float, nullable=False)  # Overall progress score
     mood_average = Column(Float, nullable=True)
     habit_completion_rate = Column(Float, nullable=True)
     goal_progress = Column(Float, nullable=True)
-    insights = Column(Text, nullable=True)  # JSON string with detailed insights
+    insights = deferred(Column(Text, nullable=True))  # JSON string with detailed insights; never listed
     period = Column(String(50), nullable=False)  # daily, weekly, monthly
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=utcnow(), nullable=False)
     
     # Relationships
-    user = relationship("User", back_populates="analytics")
+    user = relationship("User", back_populates="analytics", lazy="raise_on_sql")
 
 
 class Assessment(Base):
     """Assessment model for storing user assessment responses."""
     __tablename__ = "assessments"
+    __table_args__ = (
+        Index("ix_assessments_user_id_id", "user_id", "id"),
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     assessment_name = Column(String(255), nullable=False)
     assessment_type = Column(String(100), nullable=False)  # Type of assessment (e.g., personality, wellness, etc.)
     questions = Column(JSON, nullable=False)  # Format: {"1": ["answer1"], "2": ["answer2a", "answer2b"], ...}
     results = Column(JSON, nullable=False)  # Store any JSON structure for results
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow(), nullable=False)
+    updated_at = Column(DateTime, server_default=utcnow(), onupdate=utcnow())
     
     # Relationships
-    user = relationship("User", back_populates="assessments")
+    user = relationship("User", back_populates="assessments", lazy="raise_on_sql")
 
 
 class PersonalInspiration(Base):
     """PersonalInspiration model for storing user inspirational quotes/content."""
     __tablename__ = "personal_inspirations"
+    __table_args__ = (
+        Index("ix_personal_inspirations_user_id_created_at", "user_id", "created_at"),
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     inspiration = Column(Text, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=utcnow(), nullable=False)
     
     # Relationships
-    user = relationship("User", back_populates="personal_inspirations")
+    user = relationship("User", back_populates="personal_inspirations", lazy="raise_on_sql")
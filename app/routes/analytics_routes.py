@@ -4,7 +4,7 @@ from app.core.database import get_db
 from app.core.security import get_current_user
 from app.models.user import User
 from app.schemas.analytics_schema import ProgressResponse, AnalyticsSummary
-from app.services.analytics_service import AnalyticsService
+from app.services.analytics_service import AnalyticsService, PERIOD_DAYS, progress_cache
 from datetime import datetime
 from typing import Dict, Any
 
@@ -25,23 +25,27 @@ def get_progress_summary(
     """
     user = current_user
     
-    if period not in ["daily", "weekly", "monthly"]:
+    if period not in PERIOD_DAYS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Period must be 'daily', 'weekly', or 'monthly'",
         )
     
+    cache_key = (user.id, period)
+    cached = progress_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
     # Get summary data
     summary_data = AnalyticsService.get_user_summary(db, user.id, period)
     
     # Get mood breakdown
-    days = {"daily": 1, "weekly": 7, "monthly": 30}.get(period, 7)
-    mood_breakdown = AnalyticsService.get_mood_breakdown(db, user.id, days)
+    mood_breakdown = AnalyticsService.get_mood_breakdown(db, user.id, PERIOD_DAYS[period])
     
     # Get habit stats
     habit_stats = AnalyticsService.get_habit_stats(db, user.id)
     
-    return ProgressResponse(
+    response = ProgressResponse(
         overall_score=summary_data["overall_score"],
         mood_data={
             "average": summary_data["mood_average"],
@@ -60,6 +64,9 @@ def get_progress_summary(
         insights=summary_data["insights"],
         generated_at=datetime.utcnow(),
     )
+    progress_cache.set(cache_key, response)
+    
+    return response
 
 
 @router.get("/mood/summary", response_model=Dict[str, Any])
@@ -71,7 +78,7 @@ def get_mood_analytics(
     """Get mood analytics for a specific period."""
     user = current_user
     
-    days = {"daily": 1, "weekly": 7, "monthly": 30}.get(period, 7)
+    days = PERIOD_DAYS.get(period, 7)
     mood_breakdown = AnalyticsService.get_mood_breakdown(db, user.id, days)
     
     return {
@@ -1,13 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, load_only
+from typing import List, Optional
 from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.security import get_current_user, get_current_user_id
 from app.models.user import User, Assessment
-from app.schemas.assessment_schema import AssessmentCreate, AssessmentUpdate, AssessmentResponse
+from app.schemas.assessment_schema import AssessmentCreate, AssessmentUpdate, AssessmentResponse, AssessmentListItem
+from app.utils.helpers import delete_owned, get_owned, keyset_page, update_owned
 
 router = APIRouter(prefix="/assessments", tags=["assessments"])
 
+# Built once: validates the ORM rows and writes JSON bytes in one Rust pass
+_ASSESSMENT_LIST_ADAPTER = TypeAdapter(List[AssessmentListItem])
+
 
 @router.post("/", response_model=AssessmentResponse, status_code=status.HTTP_201_CREATED)
 def create_assessment(
@@ -18,31 +24,80 @@ def create_assessment(
     """Create a new assessment."""
     user = current_user
     
-    assessment = Assessment(
-        user_id=user.id,
-        assessment_name=assessment_data.assessment_name,
-        assessment_type=assessment_data.assessment_type,
-        questions=assessment_data.questions,
-        results=assessment_data.results,
-    )
+    # INSERT ... RETURNING hands back the populated row in one round-trip
+    assessment = db.execute(
+        insert(Assessment)
+        .values(
+            user_id=user.id,
+            assessment_name=assessment_data.assessment_name,
+            assessment_type=assessment_data.assessment_type,
+            questions=assessment_data.questions,
+            results=assessment_data.results,
+        )
+        .returning(Assessment)
+    ).scalar_one()
     
-    db.add(assessment)
     db.commit()
-    db.refresh(assessment)
     
     return assessment
 
 
-@router.get("/", response_model=List[AssessmentResponse])
-def get_assessments(
+@router.post("/bulk", response_model=List[AssessmentResponse], status_code=status.HTTP_201_CREATED)
+def create_assessments_bulk(
+    assessments_data: List[AssessmentCreate] = Body(..., min_length=1, max_length=1000),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """Get all assessments for the current user."""
-    assessments = db.query(Assessment).filter(Assessment.user_id == current_user.id).all()
+    """Create up to 1000 assessments in one request."""
+    user = current_user
+    
+    # One executemany INSERT, batched by SQLAlchemy's insertmanyvalues
+    assessments = db.scalars(
+        insert(Assessment).returning(Assessment, sort_by_parameter_order=True),
+        [{**assessment_data.model_dump(), "user_id": user.id} for assessment_data in assessments_data],
+    ).all()
+    
+    db.commit()
+    
     return assessments
 
 
+@router.get("/", response_model=List[AssessmentListItem])
+def get_assessments(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[int] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Get the current user's assessments, newest first.
+    
+    Returns summaries only; fetch `/assessments/{id}` for questions and results.
+    
+    - **limit**: Page size (1-200)
+    - **cursor**: Value of the previous page's `X-Next-Cursor` header
+    """
+    # Leave the questions/results JSON columns out of the SELECT
+    query = db.query(Assessment).options(
+        load_only(
+            Assessment.id,
+            Assessment.user_id,
+            Assessment.assessment_name,
+            Assessment.assessment_type,
+            Assessment.created_at,
+            Assessment.updated_at,
+        )
+    ).filter(Assessment.user_id == current_user.id)
+    headers = {}
+    assessments = keyset_page(query, Assessment.id, limit, cursor, headers)
+    # Skips FastAPI's dump/re-validate/encode of the response_model (kept for
+    # the docs)
+    body = _ASSESSMENT_LIST_ADAPTER.dump_json(
+        _ASSESSMENT_LIST_ADAPTER.validate_python(assessments, from_attributes=True)
+    )
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @router.get("/{assessment_id}", response_model=AssessmentResponse)
 def get_assessment(
     assessment_id: int,
@@ -50,10 +105,7 @@ def get_assessment(
     db: Session = Depends(get_db),
 ):
     """Get a specific assessment."""
-    assessment = db.query(Assessment).filter(
-        Assessment.id == assessment_id,
-        Assessment.user_id == current_user.id,
-    ).first()
+    assessment = get_owned(db, Assessment, assessment_id, current_user.id)
     
     if not assessment:
         raise HTTPException(
@@ -68,14 +120,13 @@ def get_assessment(
 def update_assessment(
     assessment_id: int,
     assessment_data: AssessmentUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db),
 ):
     """Update an assessment."""
-    assessment = db.query(Assessment).filter(
-        Assessment.id == assessment_id,
-        Assessment.user_id == current_user.id,
-    ).first()
+    update_data = assessment_data.model_dump(exclude_unset=True)
+    
+    assessment = update_owned(db, Assessment, assessment_id, current_user_id, update_data)
     
     if not assessment:
         raise HTTPException(
@@ -83,12 +134,8 @@ def update_assessment(
             detail="Assessment not found",
         )
     
-    update_data = assessment_data.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(assessment, field, value)
-    
-    db.commit()
-    db.refresh(assessment)
+    if update_data:
+        db.commit()
     
     return assessment
 
@@ -96,22 +143,16 @@ def update_assessment(
 @router.delete("/{assessment_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_assessment(
     assessment_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db),
 ):
     """Delete an assessment."""
-    assessment = db.query(Assessment).filter(
-        Assessment.id == assessment_id,
-        Assessment.user_id == current_user.id,
-    ).first()
-    
-    if not assessment:
+    if not delete_owned(db, Assessment, assessment_id, current_user_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Assessment not found",
         )
     
-    db.delete(assessment)
     db.commit()
     
     return None
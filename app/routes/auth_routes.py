@@ -1,14 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import case, insert, or_
 from sqlalchemy.orm import Session
-from datetime import timedelta
 from app.core.database import get_db
 from app.core.security import (
     hash_password,
-    verify_password,
+    verify_and_update_password,
     create_access_token,
     verify_token,
+    ACCESS_TOKEN_EXPIRES_IN,
 )
 from app.models.user import User
+from app.routes.user_routes import public_profile_cache
 from app.schemas.user_schema import UserCreate, UserResponse
 from app.schemas.auth_schema import (
     LoginRequest, 
@@ -17,14 +19,43 @@ from app.schemas.auth_schema import (
     GoogleAuthRequest,
     GoogleAuthResponse
 )
-from app.utils.email_validator import is_valid_email
 from google.oauth2 import id_token
 from google.auth.transport import requests
 from app.core.config import settings
+from cachetools import TTLCache
+from threading import Lock
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
 
+class _CachingGoogleRequest(requests.Request):
+    """Google auth transport that keeps one HTTP session and caches GETs.
+
+    verify_oauth2_token fetches Google's signing certificates on every call;
+    they rotate every few hours, so an hour-long cache is safe.
+    """
+
+    def __init__(self, ttl: int = 3600):
+        super().__init__()
+        self._cache = TTLCache(maxsize=4, ttl=ttl)
+        self._lock = Lock()
+
+    def __call__(self, url, method="GET", **kwargs):
+        if method != "GET":
+            return super().__call__(url, method=method, **kwargs)
+        with self._lock:
+            response = self._cache.get(url)
+        if response is None:
+            response = super().__call__(url, method=method, **kwargs)
+            if response.status == 200:
+                with self._lock:
+                    self._cache[url] = response
+        return response
+
+
+_google_request = _CachingGoogleRequest()
+
+
 @router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 def signup(user_data: UserCreate, db: Session = Depends(get_db)):
     """
@@ -34,17 +65,11 @@ def signup(user_data: UserCreate, db: Session = Depends(get_db)):
     - **email**: Valid email address
     - **password**: Password (minimum 8 characters) - required for email/password signup
     """
-    # Validate email format
-    if not is_valid_email(user_data.email):
-        raise HTTPException(
-            
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid email format",
-        )
-    
-    # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
-    if existing_user:
+    # Check if user already exists (EXISTS, so no row is fetched or hydrated)
+    email_taken = db.query(
+        db.query(User.id).filter(User.email == user_data.email).exists()
+    ).scalar()
+    if email_taken:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
@@ -59,19 +84,21 @@ def signup(user_data: UserCreate, db: Session = Depends(get_db)):
     
     # Create new user
     hashed_password = hash_password(user_data.password)
-    new_user = User(
-        name=user_data.name,
-        email=user_data.email,
-        password_hash=hashed_password,
-        gender=user_data.gender,
-        motivations=user_data.motivations,
-        language=user_data.language,
-        picture=user_data.picture,
-    )
+    new_user = db.execute(
+        insert(User)
+        .values(
+            name=user_data.name,
+            email=user_data.email,
+            password_hash=hashed_password,
+            gender=user_data.gender,
+            motivations=user_data.motivations,
+            language=user_data.language,
+            picture=user_data.picture,
+        )
+        .returning(User)
+    ).scalar_one()
     
-    db.add(new_user)
     db.commit()
-    db.refresh(new_user)
     
     return new_user
 
@@ -87,7 +114,12 @@ def login(credentials: LoginRequest, db: Session = Depends(get_db)):
     # Find user by email
     user = db.query(User).filter(User.email == credentials.email).first()
     
-    if not user or not verify_password(credentials.password, user.password_hash):
+    # Always pay for one bcrypt verify, so unknown emails are neither faster
+    # (user enumeration) nor a cheap path for flooding the endpoint
+    is_valid, new_hash = verify_and_update_password(
+        credentials.password, user.password_hash if user else None
+    )
+    if not is_valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
@@ -99,21 +131,22 @@ def login(credentials: LoginRequest, db: Session = Depends(get_db)):
             detail="User account is inactive",
         )
     
+    # Upgrade hashes made at an older bcrypt cost
+    if new_hash:
+        user.password_hash = new_hash
+        db.commit()
+        public_profile_cache.invalidate((user.id,))
+    
     # Create JWT token
-    access_token_expires = timedelta(minutes=30)
-    access_token = create_access_token(
-        data={"sub": str(user.id)},
-        expires_delta=access_token_expires,
-    )
+    access_token = create_access_token(data={"sub": str(user.id)})
     
     return {
         "access_token": access_token,
         "token_type": "bearer",
-        "expires_in": 30 * 60,  # in seconds
+        "expires_in": ACCESS_TOKEN_EXPIRES_IN,  # in seconds
     }
 
 
-@router.post("/google", response_model=GoogleAuthResponse)
 def google_auth(auth_data: GoogleAuthRequest, db: Session = Depends(get_db)):
     """
     Authenticate user with Google OAuth.
@@ -130,7 +163,7 @@ def google_auth(auth_data: GoogleAuthRequest, db: Session = Depends(get_db)):
         # Verify the Google ID token
         idinfo = id_token.verify_oauth2_token(
             auth_data.id_token,
-            requests.Request(),
+            _google_request,
             settings.GOOGLE_CLIENT_ID
         )
         
@@ -146,26 +179,20 @@ def google_auth(auth_data: GoogleAuthRequest, db: Session = Depends(get_db)):
                 detail="Invalid Google token - missing required fields"
             )
         
-        # Check if user exists by OAuth ID
-        user = db.query(User).filter(User.oauth_id == google_user_id).first()
+        # Look up by OAuth ID or email in one query, preferring the OAuth ID match
+        user = db.query(User).filter(
+            or_(User.oauth_id == google_user_id, User.email == email)
+        ).order_by(
+            case((User.oauth_id == google_user_id, 0), else_=1)
+        ).first()
         is_new_user = False
         
         if not user:
-            # Check if user exists by email (linking existing account)
-            user = db.query(User).filter(User.email == email).first()
-            
-            if user:
-                # Link Google account to existing user
-                user.oauth_provider = "google"
-                user.oauth_id = google_user_id
-                if picture and not user.picture:
-                    user.picture = picture
-                db.commit()
-                db.refresh(user)
-            else:
-                # Create new user
-                is_new_user = True
-                user = User(
+            # Create new user
+            is_new_user = True
+            user = db.execute(
+                insert(User)
+                .values(
                     name=name,
                     email=email,
                     oauth_provider="google",
@@ -173,22 +200,26 @@ def google_auth(auth_data: GoogleAuthRequest, db: Session = Depends(get_db)):
                     picture=picture,
                     password_hash=None,  # No password for OAuth users
                 )
-                db.add(user)
-                db.commit()
-                db.refresh(user)
+                .returning(User)
+            ).scalar_one()
+            db.commit()
+        elif user.oauth_id != google_user_id:
+            # Matched by email only: link Google account to existing user
+            user.oauth_provider = "google"
+            user.oauth_id = google_user_id
+            if picture and not user.picture:
+                user.picture = picture
+            db.commit()
+            public_profile_cache.invalidate((user.id,))
         
         # Create JWT access token
-        access_token_expires = timedelta(minutes=30)
-        access_token = create_access_token(
-            data={"sub": str(user.id)},
-            expires_delta=access_token_expires,
-        )
+        access_token = create_access_token(data={"sub": str(user.id)})
         
         # Return response with user info
         return {
             "access_token": access_token,
             "token_type": "bearer",
-            "expires_in": 30 * 60,
+            "expires_in": ACCESS_TOKEN_EXPIRES_IN,
             "user": {
                 "id": user.id,
                 "name": user.name,
@@ -212,6 +243,11 @@ def google_auth(auth_data: GoogleAuthRequest, db: Session = Depends(get_db)):
         )
 
 
+# Google sign-in is only exposed when a client ID is configured
+if settings.GOOGLE_CLIENT_ID:
+    router.post("/google", response_model=GoogleAuthResponse)(google_auth)
+
+
 @router.post("/logout", response_model=LogoutResponse)
 def logout():
     """
@@ -239,5 +275,5 @@ def refresh_token(token: str):
     return {
         "access_token": access_token,
         "token_type": "bearer",
-        "expires_in": 30 * 60,
+        "expires_in": ACCESS_TOKEN_EXPIRES_IN,
     }
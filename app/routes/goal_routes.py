@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response, status
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.security import get_current_user, get_current_user_id
 from app.models.user import User, Goal
 from app.schemas.goal_schema import GoalCreate, GoalUpdate, GoalResponse
+from app.utils.helpers import delete_owned, get_owned, keyset_page, update_owned
+from app.services.analytics_service import mark_progress_dirty
 
 router = APIRouter(prefix="/goals", tags=["goals"])
 
@@ -19,35 +22,68 @@ def create_goal(
     """Create a new goal."""
     user = current_user
     
-    goal = Goal(
-        user_id=user.id,
-        title=goal_data.title,
-        goal_type=goal_data.goal_type,
-        description=goal_data.description,
-        timeframe=goal_data.timeframe,
-    )
+    # INSERT ... RETURNING hands back the populated row in one round-trip
+    goal = db.execute(
+        insert(Goal)
+        .values(
+            user_id=user.id,
+            title=goal_data.title,
+            goal_type=goal_data.goal_type,
+            description=goal_data.description,
+            timeframe=goal_data.timeframe,
+        )
+        .returning(Goal)
+    ).scalar_one()
     
-    db.add(goal)
+    mark_progress_dirty(db, user.id)
     db.commit()
-    db.refresh(goal)
     
     return goal
 
 
-@router.get("/", response_model=List[GoalResponse])
-def get_goals(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    """Get all goals for the current user."""
-    goals = db.query(Goal).filter(Goal.user_id == current_user.id).all()
+@router.post("/bulk", response_model=List[GoalResponse], status_code=status.HTTP_201_CREATED)
+def create_goals_bulk(
+    goals_data: List[GoalCreate] = Body(..., min_length=1, max_length=1000),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Create up to 1000 goals in one request."""
+    user = current_user
+    
+    # One executemany INSERT, batched by SQLAlchemy's insertmanyvalues
+    goals = db.scalars(
+        insert(Goal).returning(Goal, sort_by_parameter_order=True),
+        [{**goal_data.model_dump(), "user_id": user.id} for goal_data in goals_data],
+    ).all()
+    
+    mark_progress_dirty(db, user.id)
+    db.commit()
+    
     return goals
 
 
+@router.get("/", response_model=List[GoalResponse])
+def get_goals(
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[int] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Get the current user's goals, newest first.
+    
+    - **limit**: Page size (1-200)
+    - **cursor**: Value of the previous page's `X-Next-Cursor` header
+    """
+    query = db.query(Goal).filter(Goal.user_id == current_user.id)
+    return keyset_page(query, Goal.id, limit, cursor, response.headers)
+
+
 @router.get("/{goal_id}", response_model=GoalResponse)
 def get_goal(goal_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     """Get a specific goal."""
-    goal = db.query(Goal).filter(
-        Goal.id == goal_id,
-        Goal.user_id == current_user.id,
-    ).first()
+    goal = get_owned(db, Goal, goal_id, current_user.id)
     
     if not goal:
         raise HTTPException(
@@ -62,14 +98,13 @@ def get_goal(goal_id: int, current_user: User = Depends(get_current_user), db: S
 def update_goal(
     goal_id: int,
     goal_data: GoalUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db),
 ):
     """Update a goal."""
-    goal = db.query(Goal).filter(
-        Goal.id == goal_id,
-        Goal.user_id == current_user.id,
-    ).first()
+    update_data = goal_data.model_dump(exclude_unset=True)
+    
+    goal = update_owned(db, Goal, goal_id, current_user_id, update_data)
     
     if not goal:
         raise HTTPException(
@@ -77,31 +112,23 @@ def update_goal(
             detail="Goal not found",
         )
     
-    update_data = goal_data.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(goal, field, value)
-    
-    db.commit()
-    db.refresh(goal)
+    if update_data:
+        mark_progress_dirty(db, current_user_id)
+        db.commit()
     
     return goal
 
 
 @router.delete("/{goal_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_goal(goal_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def delete_goal(goal_id: int, current_user_id: int = Depends(get_current_user_id), db: Session = Depends(get_db)):
     """Delete a goal."""
-    goal = db.query(Goal).filter(
-        Goal.id == goal_id,
-        Goal.user_id == current_user.id,
-    ).first()
-    
-    if not goal:
+    if not delete_owned(db, Goal, goal_id, current_user_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Goal not found",
         )
     
-    db.delete(goal)
+    mark_progress_dirty(db, current_user_id)
     db.commit()
 
 
@@ -109,33 +136,36 @@ def delete_goal(goal_id: int, current_user: User = Depends(get_current_user), db
 def update_goal_progress(
     goal_id: int,
     completion_percentage: float,
-    current_user: User = Depends(get_current_user),
+    current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db),
 ):
     """Update goal completion progress."""
-    goal = db.query(Goal).filter(
-        Goal.id == goal_id,
-        Goal.user_id == current_user.id,
-    ).first()
-    
-    if not goal:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Goal not found",
-        )
-    
     if completion_percentage < 0 or completion_percentage > 100:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Completion percentage must be between 0 and 100",
         )
     
-    goal.completion_percentage = completion_percentage
+    values = {"completion_percentage": completion_percentage}
     if completion_percentage == 100:
-        goal.is_completed = True
+        values["is_completed"] = True
+    
+    # Single UPDATE ... RETURNING instead of SELECT, mutate, COMMIT, refresh
+    goal = db.execute(
+        update(Goal)
+        .where(Goal.id == goal_id, Goal.user_id == current_user_id)
+        .values(**values)
+        .returning(Goal)
+    ).scalar_one_or_none()
+    
+    if not goal:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Goal not found",
+        )
     
+    mark_progress_dirty(db, current_user_id)
     db.commit()
-    db.refresh(goal)
     
     return goal
 
@@ -143,14 +173,11 @@ def update_goal_progress(
 @router.patch("/{goal_id}/toggle-completed", response_model=GoalResponse)
 def toggle_goal_completed(
     goal_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db),
 ):
     """Toggle the completed status of a goal."""
-    goal = db.query(Goal).filter(
-        Goal.id == goal_id,
-        Goal.user_id == current_user.id,
-    ).first()
+    goal = get_owned(db, Goal, goal_id, current_user_id)
     
     if not goal:
         raise HTTPException(
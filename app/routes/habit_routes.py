@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import case, update
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.security import get_current_user, get_current_user_id
 from app.models.user import User, Habit
 from app.schemas.habit_schema import HabitCreate, HabitUpdate, HabitResponse
+from app.services.analytics_service import mark_progress_dirty
+from app.utils.helpers import delete_owned, etag_matches, keyset_page, list_etag, update_owned
 
 router = APIRouter(prefix="/habits", tags=["habits"])
 
@@ -29,16 +32,35 @@ def create_habit(
     
     db.add(habit)
     db.commit()
-    db.refresh(habit)
     
     return habit
 
 
 @router.get("/", response_model=List[HabitResponse])
-def get_habits(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    """Get all habits for the current user."""
-    habits = db.query(Habit).filter(Habit.user_id == current_user.id).all()
-    return habits
+def get_habits(
+    request: Request,
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[int] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Get the current user's habits, newest first.
+    
+    - **limit**: Page size (1-200)
+    - **cursor**: Value of the previous page's `X-Next-Cursor` header
+    """
+    # Unchanged since the client's copy: skip loading and serializing rows
+    etag = list_etag(db, Habit, current_user.id)
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    
+    # Plain column rows: the response schema reads them directly, without
+    # building and tracking an ORM object per row
+    query = db.query(*Habit.__table__.columns).filter(Habit.user_id == current_user.id)
+    return keyset_page(query, Habit.id, limit, cursor, response.headers)
 
 
 @router.get("/{habit_id}", response_model=HabitResponse)
@@ -62,14 +84,12 @@ def get_habit(habit_id: int, current_user: User = Depends(get_current_user), db:
 def update_habit(
     habit_id: int,
     habit_data: HabitUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db),
 ):
     """Update a habit."""
-    habit = db.query(Habit).filter(
-        Habit.id == habit_id,
-        Habit.user_id == current_user.id,
-    ).first()
+    update_data = habit_data.model_dump(exclude_unset=True)
+    habit = update_owned(db, Habit, habit_id, current_user_id, update_data)
     
     if not habit:
         raise HTTPException(
@@ -77,46 +97,45 @@ def update_habit(
             detail="Habit not found",
         )
     
-    # Update fields
-    update_data = habit_data.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(habit, field, value)
-    
-    db.commit()
-    db.refresh(habit)
+    if update_data:
+        mark_progress_dirty(db, current_user_id)
+        db.commit()
     
     return habit
 
 
 @router.delete("/{habit_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_habit(habit_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def delete_habit(habit_id: int, current_user_id: int = Depends(get_current_user_id), db: Session = Depends(get_db)):
     """Delete a habit."""
-    habit = db.query(Habit).filter(
-        Habit.id == habit_id,
-        Habit.user_id == current_user.id,
-    ).first()
-    
-    if not habit:
+    if not delete_owned(db, Habit, habit_id, current_user_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Habit not found",
         )
     
-    db.delete(habit)
+    mark_progress_dirty(db, current_user_id)
     db.commit()
 
 
 @router.post("/{habit_id}/complete", response_model=HabitResponse)
 def mark_habit_complete(
     habit_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db),
 ):
     """Mark a habit as completed for today."""
-    habit = db.query(Habit).filter(
-        Habit.id == habit_id,
-        Habit.user_id == current_user.id,
-    ).first()
+    # Increment streak and update success rate in the database, so concurrent
+    # completions can't overwrite each other
+    new_rate = Habit.success_rate + 5.0
+    habit = db.execute(
+        update(Habit)
+        .where(Habit.id == habit_id, Habit.user_id == current_user_id)
+        .values(
+            streak_count=Habit.streak_count + 1,
+            success_rate=case((new_rate > 100.0, 100.0), else_=new_rate),
+        )
+        .returning(Habit)
+    ).scalar_one_or_none()
     
     if not habit:
         raise HTTPException(
@@ -124,11 +143,7 @@ def mark_habit_complete(
             detail="Habit not found",
         )
     
-    # Increment streak and update success rate
-    habit.streak_count += 1
-    habit.success_rate = min(100.0, habit.success_rate + 5.0)
-    
+    mark_progress_dirty(db, current_user_id)
     db.commit()
-    db.refresh(habit)
     
     return habit
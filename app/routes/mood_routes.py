@@ -1,14 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from typing import List
-from datetime import datetime
+from typing import List, Optional
+from datetime import datetime, timedelta
 from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.security import get_current_user, get_current_user_id
 from app.models.user import User, Mood
 from app.schemas.mood_schema import MoodCreate, MoodUpdate, MoodResponse, MoodSummary
+from app.services.analytics_service import mark_progress_dirty
+from app.utils.helpers import MOOD_SCORES, delete_owned, keyset_page, response_columns, update_owned
 
 router = APIRouter(prefix="/moods", tags=["moods"])
 
+_MOOD_COLUMNS = response_columns(Mood, MoodResponse)
+
 
 
 
@@ -32,16 +38,29 @@ def create_mood(
     
     db.add(mood)
     db.commit()
-    db.refresh(mood)
     
     return mood
 
 
 @router.get("/", response_model=List[MoodResponse])
-def get_moods(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    """Get all mood entries for the current user."""
-    moods = db.query(Mood).filter(Mood.user_id == current_user.id).order_by(Mood.timestamp.desc()).all()
-    return moods
+def get_moods(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Get the current user's mood entries, most recent first.
+    
+    - **limit**: Page size (1-200)
+    - **cursor**: Value of the previous page's `X-Next-Cursor` header
+    """
+    headers = {}
+    query = db.query(*_MOOD_COLUMNS).filter(Mood.user_id == current_user.id)
+    moods = keyset_page(query, Mood.timestamp, limit, cursor, headers, Mood.id)
+    # Rows selected in MoodResponse's shape go straight to orjson, skipping
+    # ORM objects and per-row response_model validation (kept for the docs)
+    return ORJSONResponse([mood._asdict() for mood in moods], headers=headers)
 
 
 @router.get("/{mood_id}", response_model=MoodResponse)
@@ -65,14 +84,12 @@ def get_mood(mood_id: int, current_user: User = Depends(get_current_user), db: S
 def update_mood(
     mood_id: int,
     mood_data: MoodUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db),
 ):
     """Update a mood entry."""
-    mood = db.query(Mood).filter(
-        Mood.id == mood_id,
-        Mood.user_id == current_user.id,
-    ).first()
+    update_data = mood_data.model_dump(exclude_unset=True)
+    mood = update_owned(db, Mood, mood_id, current_user_id, update_data)
     
     if not mood:
         raise HTTPException(
@@ -80,31 +97,23 @@ def update_mood(
             detail="Mood entry not found",
         )
     
-    update_data = mood_data.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(mood, field, value)
-    
-    db.commit()
-    db.refresh(mood)
+    if update_data:
+        mark_progress_dirty(db, current_user_id)
+        db.commit()
     
     return mood
 
 
 @router.delete("/{mood_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_mood(mood_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def delete_mood(mood_id: int, current_user_id: int = Depends(get_current_user_id), db: Session = Depends(get_db)):
     """Delete a mood entry."""
-    mood = db.query(Mood).filter(
-        Mood.id == mood_id,
-        Mood.user_id == current_user.id,
-    ).first()
-    
-    if not mood:
+    if not delete_owned(db, Mood, mood_id, current_user_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Mood entry not found",
         )
     
-    db.delete(mood)
+    mark_progress_dirty(db, current_user_id)
     db.commit()
 
 
@@ -113,15 +122,20 @@ def get_weekly_mood_summary(current_user: User = Depends(get_current_user), db:
     """Get weekly mood summary."""
     user = current_user
     
-    from datetime import timedelta
     start_date = datetime.utcnow() - timedelta(days=7)
     
-    moods = db.query(Mood).filter(
+    # Counts and intensity totals per mood type, aggregated in SQL
+    rows = db.query(
+        Mood.mood_type,
+        func.count(Mood.id),
+        func.sum(Mood.intensity),
+        func.count(Mood.intensity),
+    ).filter(
         Mood.user_id == user.id,
         Mood.created_at >= start_date,
-    ).all()
+    ).group_by(Mood.mood_type).all()
     
-    if not moods:
+    if not rows:
         return MoodSummary(
             period="weekly",
             average_mood="neutral",
@@ -131,29 +145,17 @@ def get_weekly_mood_summary(current_user: User = Depends(get_current_user), db:
             mood_breakdown={},
         )
     
-    mood_breakdown = {}
-    total_intensity = 0
-    count_with_intensity = 0
-    
-    for mood in moods:
-        mood_breakdown[mood.mood_type] = mood_breakdown.get(mood.mood_type, 0) + 1
-        if mood.intensity:
-            total_intensity += mood.intensity
-            count_with_intensity += 1
+    mood_breakdown = {mood_type: count for mood_type, count, _, _ in rows}
+    total_entries = sum(mood_breakdown.values())
+    total_intensity = sum(intensity_sum or 0 for _, _, intensity_sum, _ in rows)
+    count_with_intensity = sum(intensity_count for _, _, _, intensity_count in rows)
     
     most_common = max(mood_breakdown, key=mood_breakdown.get)
     average_intensity = total_intensity / count_with_intensity if count_with_intensity > 0 else None
     
-    mood_scores = {
-        "excellent": 5,
-        "good": 4,
-        "neutral": 3,
-        "sad": 1,
-        "anxious": 2,
-        "angry": 1,
-    }
-    
-    avg_score = sum(mood_scores.get(m.mood_type, 0) for m in moods) / len(moods)
+    avg_score = sum(
+        MOOD_SCORES.get(mood_type, 0) * count for mood_type, count in mood_breakdown.items()
+    ) / total_entries
     if avg_score >= 4:
         avg_mood = "excellent"
     elif avg_score >= 3:
@@ -168,6 +170,6 @@ def get_weekly_mood_summary(current_user: User = Depends(get_current_user), db:
         average_mood=avg_mood,
         average_intensity=average_intensity,
         most_common_mood=most_common,
-        total_entries=len(moods),
+        total_entries=total_entries,
         mood_breakdown=mood_breakdown,
     )
@@ -1,13 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import update
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.security import get_current_user, get_current_user_id
 from app.models.user import User, Note
 from app.schemas.note_schema import NoteCreate, NoteUpdate, NoteResponse
+from app.utils.helpers import delete_owned, etag_matches, keyset_page, list_etag, response_columns, update_owned
 
 router = APIRouter(prefix="/notes", tags=["notes"])
 
+_NOTE_COLUMNS = response_columns(Note, NoteResponse)
+
 
 
 
@@ -29,16 +34,35 @@ def create_note(
     
     db.add(note)
     db.commit()
-    db.refresh(note)
     
     return note
 
 
 @router.get("/", response_model=List[NoteResponse])
-def get_notes(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    """Get all notes for the current user."""
-    notes = db.query(Note).filter(Note.user_id == current_user.id).order_by(Note.updated_at.desc()).all()
-    return notes
+def get_notes(
+    request: Request,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Get the current user's notes, most recently updated first.
+    
+    - **limit**: Page size (1-200)
+    - **cursor**: Value of the previous page's `X-Next-Cursor` header
+    """
+    # Unchanged since the client's copy: skip loading and serializing rows
+    etag = list_etag(db, Note, current_user.id)
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    headers = {"ETag": etag}
+    query = db.query(*_NOTE_COLUMNS).filter(Note.user_id == current_user.id)
+    notes = keyset_page(query, Note.updated_at, limit, cursor, headers, Note.id)
+    # Rows selected in NoteResponse's shape go straight to orjson, skipping
+    # ORM objects and per-row response_model validation (kept for the docs)
+    return ORJSONResponse([note._asdict() for note in notes], headers=headers)
 
 
 @router.get("/{note_id}", response_model=NoteResponse)
@@ -62,14 +86,12 @@ def get_note(note_id: int, current_user: User = Depends(get_current_user), db: S
 def update_note(
     note_id: int,
     note_data: NoteUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db),
 ):
     """Update a note."""
-    note = db.query(Note).filter(
-        Note.id == note_id,
-        Note.user_id == current_user.id,
-    ).first()
+    update_data = note_data.model_dump(exclude_unset=True)
+    note = update_owned(db, Note, note_id, current_user_id, update_data)
     
     if not note:
         raise HTTPException(
@@ -77,41 +99,33 @@ def update_note(
             detail="Note not found",
         )
     
-    update_data = note_data.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(note, field, value)
-    
-    db.commit()
-    db.refresh(note)
+    if update_data:
+        db.commit()
     
     return note
 
 
 @router.delete("/{note_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_note(note_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def delete_note(note_id: int, current_user_id: int = Depends(get_current_user_id), db: Session = Depends(get_db)):
     """Delete a note."""
-    note = db.query(Note).filter(
-        Note.id == note_id,
-        Note.user_id == current_user.id,
-    ).first()
-    
-    if not note:
+    if not delete_owned(db, Note, note_id, current_user_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Note not found",
         )
     
-    db.delete(note)
     db.commit()
 
 
 @router.post("/{note_id}/pin", response_model=NoteResponse)
-def pin_note(note_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def pin_note(note_id: int, current_user_id: int = Depends(get_current_user_id), db: Session = Depends(get_db)):
     """Pin a note."""
-    note = db.query(Note).filter(
-        Note.id == note_id,
-        Note.user_id == current_user.id,
-    ).first()
+    note = db.execute(
+        update(Note)
+        .where(Note.id == note_id, Note.user_id == current_user_id)
+        .values(is_pinned=True)
+        .returning(Note)
+    ).scalar_one_or_none()
     
     if not note:
         raise HTTPException(
@@ -119,20 +133,20 @@ def pin_note(note_id: int, current_user: User = Depends(get_current_user), db: S
             detail="Note not found",
         )
     
-    note.is_pinned = True
     db.commit()
-    db.refresh(note)
     
     return note
 
 
 @router.post("/{note_id}/unpin", response_model=NoteResponse)
-def unpin_note(note_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def unpin_note(note_id: int, current_user_id: int = Depends(get_current_user_id), db: Session = Depends(get_db)):
     """Unpin a note."""
-    note = db.query(Note).filter(
-        Note.id == note_id,
-        Note.user_id == current_user.id,
-    ).first()
+    note = db.execute(
+        update(Note)
+        .where(Note.id == note_id, Note.user_id == current_user_id)
+        .values(is_pinned=False)
+        .returning(Note)
+    ).scalar_one_or_none()
     
     if not note:
         raise HTTPException(
@@ -140,8 +154,6 @@ def unpin_note(note_id: int, current_user: User = Depends(get_current_user), db:
             detail="Note not found",
         )
     
-    note.is_pinned = False
     db.commit()
-    db.refresh(note)
     
     return note
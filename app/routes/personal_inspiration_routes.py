@@ -1,14 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.security import get_current_user, get_current_user_id
 from app.models.user import User, PersonalInspiration
 from app.schemas.personal_inspiration_schema import (
     PersonalInspirationCreate,
     PersonalInspirationUpdate,
     PersonalInspirationResponse,
 )
+from app.utils.helpers import delete_owned, keyset_page, update_owned
 
 router = APIRouter(prefix="/inspirations", tags=["inspirations"])
 
@@ -29,21 +30,30 @@ def create_inspiration(
     
     db.add(inspiration)
     db.commit()
-    db.refresh(inspiration)
     
     return inspiration
 
 
 @router.get("/", response_model=List[PersonalInspirationResponse])
 def get_inspirations(
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """Get all personal inspirations for the current user."""
-    inspirations = db.query(PersonalInspiration).filter(
+    """
+    Get the current user's personal inspirations, newest first.
+    
+    - **limit**: Page size (1-200)
+    - **cursor**: Value of the previous page's `X-Next-Cursor` header
+    """
+    # Plain column rows: the response schema reads them directly, without
+    # building and tracking an ORM object per row
+    query = db.query(*PersonalInspiration.__table__.columns).filter(
         PersonalInspiration.user_id == current_user.id
-    ).order_by(PersonalInspiration.created_at.desc()).all()
-    return inspirations
+    )
+    return keyset_page(query, PersonalInspiration.created_at, limit, cursor, response.headers, PersonalInspiration.id)
 
 
 @router.get("/{inspiration_id}", response_model=PersonalInspirationResponse)
@@ -71,14 +81,12 @@ def get_inspiration(
 def update_inspiration(
     inspiration_id: int,
     inspiration_data: PersonalInspirationUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db),
 ):
     """Update a personal inspiration."""
-    inspiration = db.query(PersonalInspiration).filter(
-        PersonalInspiration.id == inspiration_id,
-        PersonalInspiration.user_id == current_user.id,
-    ).first()
+    update_data = inspiration_data.model_dump(exclude_unset=True)
+    inspiration = update_owned(db, PersonalInspiration, inspiration_id, current_user_id, update_data)
     
     if not inspiration:
         raise HTTPException(
@@ -86,12 +94,8 @@ def update_inspiration(
             detail="Inspiration not found",
         )
     
-    update_data = inspiration_data.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(inspiration, field, value)
-    
-    db.commit()
-    db.refresh(inspiration)
+    if update_data:
+        db.commit()
     
     return inspiration
 
@@ -99,22 +103,16 @@ def update_inspiration(
 @router.delete("/{inspiration_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_inspiration(
     inspiration_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db),
 ):
     """Delete a personal inspiration."""
-    inspiration = db.query(PersonalInspiration).filter(
-        PersonalInspiration.id == inspiration_id,
-        PersonalInspiration.user_id == current_user.id,
-    ).first()
-    
-    if not inspiration:
+    if not delete_owned(db, PersonalInspiration, inspiration_id, current_user_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Inspiration not found",
         )
     
-    db.delete(inspiration)
     db.commit()
     
     return None
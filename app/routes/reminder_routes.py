@@ -1,13 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
-from datetime import datetime
+from typing import List, Optional
+from datetime import datetime, timedelta
 from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.scheduler import scheduler
+from app.core.security import get_current_user, get_current_user_id
 from app.models.user import User, Reminder
 from app.schemas.reminder_schema import ReminderCreate, ReminderUpdate, ReminderResponse, TimerRequest
 from app.services.reminder_service import ReminderService
-from app.services.notification_service import NotificationService
+from app.utils.helpers import delete_owned, etag_matches, keyset_page, list_etag, update_owned
 
 router = APIRouter(prefix="/reminders", tags=["reminders"])
 
@@ -38,10 +39,30 @@ def create_reminder(
 
 
 @router.get("/", response_model=List[ReminderResponse])
-def get_reminders(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    """Get all reminders for the current user."""
-    reminders = db.query(Reminder).filter(Reminder.user_id == current_user.id).all()
-    return reminders
+def get_reminders(
+    request: Request,
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[int] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Get the current user's reminders, newest first.
+    
+    - **limit**: Page size (1-200)
+    - **cursor**: Value of the previous page's `X-Next-Cursor` header
+    """
+    # Unchanged since the client's copy: skip loading and serializing rows
+    etag = list_etag(db, Reminder, current_user.id)
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    
+    # Plain column rows: the response schema reads them directly, without
+    # building and tracking an ORM object per row
+    query = db.query(*Reminder.__table__.columns).filter(Reminder.user_id == current_user.id)
+    return keyset_page(query, Reminder.id, limit, cursor, response.headers)
 
 
 @router.get("/{reminder_id}", response_model=ReminderResponse)
@@ -65,14 +86,12 @@ def get_reminder(reminder_id: int, current_user: User = Depends(get_current_user
 def update_reminder(
     reminder_id: int,
     reminder_data: ReminderUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db),
 ):
     """Update a reminder."""
-    reminder = db.query(Reminder).filter(
-        Reminder.id == reminder_id,
-        Reminder.user_id == current_user.id,
-    ).first()
+    update_data = reminder_data.model_dump(exclude_unset=True)
+    reminder = update_owned(db, Reminder, reminder_id, current_user_id, update_data)
     
     if not reminder:
         raise HTTPException(
@@ -80,30 +99,27 @@ def update_reminder(
             detail="Reminder not found",
         )
     
-    update_data = reminder_data.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(reminder, field, value)
-    
-    db.commit()
-    db.refresh(reminder)
+    if update_data:
+        db.commit()
     
     return reminder
 
 
 @router.delete("/{reminder_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_reminder(reminder_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def delete_reminder(reminder_id: int, current_user_id: int = Depends(get_current_user_id), db: Session = Depends(get_db)):
     """Delete a reminder."""
-    if not ReminderService.delete_reminder(db, reminder_id):
+    if not delete_owned(db, Reminder, reminder_id, current_user_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Reminder not found",
         )
+    
+    db.commit()
 
 
 @router.post("/timer/start", status_code=status.HTTP_202_ACCEPTED)
 def start_timer(
     timer_data: TimerRequest,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -116,8 +132,8 @@ def start_timer(
     """
     user = current_user
     
-    # Create a reminder with trigger time
-    trigger_time = datetime.utcnow()
+    # The reminder's trigger time is when the timer completes
+    trigger_time = datetime.utcnow() + timedelta(seconds=timer_data.duration_seconds)
     reminder = ReminderService.create_reminder(
         db=db,
         user_id=user.id,
@@ -127,24 +143,13 @@ def start_timer(
         trigger_time=trigger_time,
     )
     
-    # Schedule background task to trigger notification
-    async def trigger_notification():
-        import asyncio
-        await asyncio.sleep(timer_data.duration_seconds)
-        
-        # Update reminder status
-        ReminderService.update_reminder_status(db, reminder.id, "triggered")
-        
-        # Send notification
-        notification = NotificationService.create_notification(
-            user_id=user.id,
-            reminder_id=reminder.id,
-            title=reminder.title,
-            message=reminder.message,
-        )
-        NotificationService.send_notification(notification)
-    
-    background_tasks.add_task(trigger_notification)
+    # A scheduler job fires the notification; nothing is held open meanwhile
+    scheduler.add_job(
+        ReminderService.fire_timer,
+        "date",
+        run_date=trigger_time,
+        args=[reminder.id],
+    )
     
     return {
         "message": "Timer started",
@@ -163,14 +168,13 @@ def get_pending_reminders(current_user: User = Depends(get_current_user), db: Se
 @router.post("/{reminder_id}/complete", response_model=ReminderResponse)
 def mark_reminder_complete(
     reminder_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db),
 ):
     """Mark a reminder as completed."""
-    reminder = db.query(Reminder).filter(
-        Reminder.id == reminder_id,
-        Reminder.user_id == current_user.id,
-    ).first()
+    reminder = ReminderService.update_reminder_status(
+        db, reminder_id, "completed", user_id=current_user_id
+    )
     
     if not reminder:
         raise HTTPException(
@@ -178,5 +182,4 @@ def mark_reminder_complete(
             detail="Reminder not found",
         )
     
-    reminder = ReminderService.update_reminder_status(db, reminder_id, "completed")
     return reminder
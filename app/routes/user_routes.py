@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
+from app.core.cache import ResponseCache
 from app.core.database import get_db
 from app.core.security import get_current_user, verify_password, hash_password
 from app.models.user import User
@@ -7,6 +8,7 @@ from app.schemas.user_schema import (
     UserResponse,
     UserUpdate,
     UserProfileResponse,
+    ProfileUpdateResponse,
     ChangePasswordRequest,
     ChangePasswordResponse,
 )
@@ -21,17 +23,32 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/user", tags=["user"])
 
+# Rendered profile JSON keyed by (user_id, updated_at). Any write to the user
+# row bumps updated_at, so an outdated entry is simply never matched again.
+# Cached hits are returned as-is, skipping response_model re-validation and
+# encoding (the response_model is kept for the docs).
+profile_cache = ResponseCache(maxsize=1_000, ttl=300)
+
+# Rendered public profile JSON keyed by (user_id,). There is no loaded user to
+# read updated_at from, so writers to the user row invalidate (user_id,).
+public_profile_cache = ResponseCache(maxsize=1_000, ttl=60)
+
 
 # Use get_current_user dependency from app.core.security
 
 
 @router.get("/profile", response_model=UserProfileResponse)
-def get_profile(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def get_profile(current_user: User = Depends(get_current_user)):
     """Get current user's profile."""
-    return current_user
+    cache_key = (current_user.id, current_user.updated_at)
+    body = profile_cache.get(cache_key)
+    if body is None:
+        body = UserProfileResponse.from_orm_trusted(current_user).model_dump_json()
+        profile_cache.set(cache_key, body)
+    return Response(content=body, media_type="application/json")
 
 
-@router.put("/profile")
+@router.put("/profile", response_model=ProfileUpdateResponse)
 def update_profile(
     profile_data: UserUpdate,
     current_user: User = Depends(get_current_user),
@@ -40,9 +57,9 @@ def update_profile(
     """Update user profile with Base64 image support."""
     try:
         user = current_user
-        update_data = profile_data.dict(exclude_unset=True)
+        update_data = profile_data.model_dump(exclude_unset=True)
         
-        logger.info(f"Updating user {user.id} profile")
+        logger.info("Updating user %s profile", user.id)
         
         # Process Base64 image if present
         if 'picture' in update_data and update_data['picture']:
@@ -54,19 +71,21 @@ def update_profile(
                 )
             update_data['picture'] = processed_image
         
-        # Update user fields
-        for field, value in update_data.items():
-            setattr(user, field, value)
-        
-        db.commit()
-        db.refresh(user)
+        if update_data:
+            # current_user is already loaded in this session, so the commit is
+            # the single UPDATE; eager_defaults brings updated_at back with it
+            for field, value in update_data.items():
+                setattr(user, field, value)
+            
+            db.commit()
+            public_profile_cache.invalidate((user.id,))
         
         return {"success": True, "message": "Profile updated successfully", "user": user}
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error updating profile for user {current_user.id}: {e}")
+        logger.error("Error updating profile for user %s: %s", current_user.id, e)
         db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -77,7 +96,12 @@ def update_profile(
 @router.get("/profile/{user_id}", response_model=UserResponse)
 def get_user_profile(user_id: int, db: Session = Depends(get_db)):
     """Get a user's profile (public information)."""
-    user = db.query(User).filter(User.id == user_id).first()
+    cache_key = (user_id,)
+    body = public_profile_cache.get(cache_key)
+    if body is not None:
+        return Response(content=body, media_type="application/json")
+    
+    user = db.get(User, user_id)
     
     if not user:
         raise HTTPException(
@@ -85,7 +109,9 @@ def get_user_profile(user_id: int, db: Session = Depends(get_db)):
             detail="User not found",
         )
     
-    return user
+    body = UserResponse.from_orm_trusted(user).model_dump_json()
+    public_profile_cache.set(cache_key, body)
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("/change-password", response_model=ChangePasswordResponse)
@@ -97,6 +123,11 @@ def change_password(
     """Change user password."""
     user = current_user
     
+    # Nothing is pending yet: end the read transaction so the pooled
+    # connection isn't held through two bcrypt rounds (expire_on_commit is
+    # off, so user stays loaded). The final commit checks one out again.
+    db.commit()
+    
     # Verify current password
     if not verify_password(password_data.current_password, user.password_hash):
         raise HTTPException(
@@ -107,5 +138,6 @@ def change_password(
     # Update password
     user.password_hash = hash_password(password_data.new_password)
     db.commit()
+    public_profile_cache.invalidate((user.id,))
     
     return ChangePasswordResponse(message="Password changed successfully")
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 
@@ -55,5 +55,16 @@ class AssessmentResponse(AssessmentBase):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class AssessmentListItem(BaseModel):
+    """Assessment summary for list views; omits the questions/results JSON."""
+    id: int
+    user_id: int
+    assessment_name: str
+    assessment_type: str
+    created_at: datetime
+    updated_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 from typing import Optional, List, Any
 from datetime import datetime
 
@@ -31,14 +31,24 @@ class UserUpdate(BaseModel):
 
 class UserResponse(UserBase):
     """Schema for user responses."""
+    # Stored emails were validated on the way in; skip email-validator here
+    email: str
     id: int
     role: str
     is_active: bool
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+    
+    @classmethod
+    def from_orm_trusted(cls, obj: Any) -> "UserResponse":
+        """Build from a loaded User row without re-running field validation.
+        
+        Only for rows read back from the database, which were validated on
+        the way in.
+        """
+        return cls.model_construct(**{name: getattr(obj, name) for name in cls.model_fields})
 
 
 class UserProfileResponse(UserResponse):
@@ -52,8 +62,7 @@ class ProfileUpdateResponse(BaseModel):
     message: str
     user: UserResponse
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ChangePasswordRequest(BaseModel):
@@ -1,13 +1,102 @@
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
-from sqlalchemy import func, and_
+from types import MappingProxyType
+from itertools import chain
+import orjson
+from sqlalchemy import bindparam, case, event, func, select, true
+from app.core.cache import ResponseCache
 from app.models.user import Mood, Habit, Goal, Analytics
-from app.utils.helpers import (
-    calculate_mood_average,
-    calculate_habit_completion_rate,
-    calculate_goal_progress,
-    generate_insights,
-)
+from app.utils.helpers import MOOD_SCORES, generate_insights, mood_average_from_score
+
+
+# Look-back window for each summary period; unknown periods fall back to weekly
+PERIOD_DAYS = MappingProxyType({"daily": 1, "weekly": 7, "monthly": 30})
+
+# Overall-score contribution of each average mood; anything else scores 50
+_MOOD_AVERAGE_SCORES = MappingProxyType({"excellent": 100, "good": 80, "neutral": 60, "sad": 40})
+
+# Progress summaries keyed by (user_id, period). Writes to any source table
+# invalidate the user's entries once the transaction commits.
+progress_cache = ResponseCache(maxsize=10_000, ttl=300)
+
+_PROGRESS_SOURCES = (Mood, Habit, Goal)
+
+
+# Statements are built once at import with named bind parameters, so each call
+# only binds values: no per-call construction or cache-key generation.
+
+def _build_summary_statement():
+    """One-row aggregates for moods, active habits and goals, joined."""
+    moods = select(
+        func.count(Mood.id).label("mood_count"),
+        func.sum(case(MOOD_SCORES, value=Mood.mood_type, else_=0)).label("mood_score"),
+    ).where(
+        Mood.user_id == bindparam("user_id"),
+        Mood.created_at >= bindparam("start_date"),
+        Mood.created_at <= bindparam("now"),
+    ).subquery()
+    habits = select(
+        func.count(Habit.id).label("habit_count"),
+        func.avg(Habit.success_rate).label("habit_rate"),
+    ).where(
+        Habit.user_id == bindparam("user_id"),
+        Habit.is_active == True,
+    ).subquery()
+    goals = select(
+        func.count(Goal.id).label("goal_count"),
+        func.avg(Goal.completion_percentage).label("goal_progress"),
+    ).where(
+        Goal.user_id == bindparam("user_id"),
+    ).subquery()
+    return select(moods, habits, goals).select_from(
+        moods.join(habits, true()).join(goals, true())
+    )
+
+
+_SUMMARY_STMT = _build_summary_statement()
+
+# Counted in SQL off the (user_id, created_at) covering index
+_MOOD_BREAKDOWN_STMT = select(Mood.mood_type, func.count(Mood.id)).where(
+    Mood.user_id == bindparam("user_id"),
+    Mood.created_at >= bindparam("start_date"),
+).group_by(Mood.mood_type)
+
+_HABIT_STATS_STMT = select(
+    func.count(Habit.id),
+    func.count(Habit.id).filter(Habit.is_active == True),
+    func.avg(Habit.streak_count),
+    func.avg(Habit.success_rate),
+).where(Habit.user_id == bindparam("user_id"))
+
+
+def mark_progress_dirty(session: Session, user_id: int) -> None:
+    """Invalidate a user's cached summaries when the session next commits.
+
+    ORM flushes are tracked automatically; statement-level INSERT/UPDATE/DELETE
+    on moods, habits or goals must call this.
+    """
+    session.info.setdefault("progress_dirty_users", set()).add(user_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_progress_writes(session, flush_context):
+    """Remember which users had analytics source rows change in this flush."""
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, _PROGRESS_SOURCES):
+            mark_progress_dirty(session, obj.user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_progress_cache(session):
+    """Drop cached summaries for users whose data just committed."""
+    for user_id in session.info.pop("progress_dirty_users", ()):
+        progress_cache.invalidate(*((user_id, period) for period in PERIOD_DAYS))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_progress_writes(session):
+    """Forget pending invalidations when the transaction rolls back."""
+    session.info.pop("progress_dirty_users", None)
 
 
 class AnalyticsService:
@@ -25,42 +114,20 @@ class AnalyticsService:
         """
         # Calculate time range
         now = datetime.utcnow()
-        if period == "daily":
-            start_date = now - timedelta(days=1)
-        elif period == "weekly":
-            start_date = now - timedelta(days=7)
-        elif period == "monthly":
-            start_date = now - timedelta(days=30)
-        else:
-            start_date = now - timedelta(days=7)
-        
-        # Get moods for period
-        moods = db.query(Mood).filter(
-            and_(
-                Mood.user_id == user_id,
-                Mood.created_at >= start_date,
-                Mood.created_at <= now,
-            )
-        ).all()
+        start_date = now - timedelta(days=PERIOD_DAYS.get(period, 7))
         
-        # Get habits
-        habits = db.query(Habit).filter(
-            Habit.user_id == user_id,
-            Habit.is_active == True,
-        ).all()
-        
-        # Get goals
-        goals = db.query(Goal).filter(
-            Habit.user_id == user_id,
-        ).all()
+        # One round trip: a single-row aggregate per source table, joined
+        stats = db.execute(
+            _SUMMARY_STMT, {"user_id": user_id, "start_date": start_date, "now": now}
+        ).one()
         
         # Calculate metrics
-        mood_avg = calculate_mood_average(moods)
-        habit_rate = calculate_habit_completion_rate(habits)
-        goal_progress = calculate_goal_progress(goals)
+        mood_avg = mood_average_from_score(stats.mood_score or 0, stats.mood_count)
+        habit_rate = float(stats.habit_rate or 0.0)
+        goal_progress = float(stats.goal_progress or 0.0)
         
         # Calculate overall score (0-100)
-        mood_score = {"excellent": 100, "good": 80, "neutral": 60, "sad": 40}.get(mood_avg, 50)
+        mood_score = _MOOD_AVERAGE_SCORES.get(mood_avg, 50)
         overall_score = (mood_score + habit_rate * 100 + goal_progress) / 3
         
         # Generate insights
@@ -71,9 +138,9 @@ class AnalyticsService:
             "mood_average": mood_avg,
             "habit_completion_rate": round(habit_rate, 2),
             "goal_progress": round(goal_progress, 2),
-            "mood_count": len(moods),
-            "habit_count": len(habits),
-            "goal_count": len(goals),
+            "mood_count": stats.mood_count,
+            "habit_count": stats.habit_count,
+            "goal_count": stats.goal_count,
             "insights": insights,
             "period": period,
         }
@@ -83,36 +150,25 @@ class AnalyticsService:
         """Get mood breakdown for the last N days."""
         start_date = datetime.utcnow() - timedelta(days=days)
         
-        moods = db.query(Mood).filter(
-            and_(
-                Mood.user_id == user_id,
-                Mood.created_at >= start_date,
-            )
-        ).all()
-        
-        mood_breakdown = {}
-        for mood in moods:
-            mood_breakdown[mood.mood_type] = mood_breakdown.get(mood.mood_type, 0) + 1
+        rows = db.execute(_MOOD_BREAKDOWN_STMT, {"user_id": user_id, "start_date": start_date})
         
-        return mood_breakdown
+        return {mood_type: count for mood_type, count in rows}
     
     @staticmethod
     def get_habit_stats(db: Session, user_id: int) -> dict:
         """Get habit statistics."""
-        habits = db.query(Habit).filter(Habit.user_id == user_id).all()
+        total, active, avg_streak, avg_success_rate = db.execute(
+            _HABIT_STATS_STMT, {"user_id": user_id}
+        ).one()
         
-        if not habits:
+        if not total:
             return {"total": 0, "active": 0, "avg_streak": 0, "avg_success_rate": 0}
         
-        active_habits = [h for h in habits if h.is_active]
-        avg_streak = sum(h.streak_count for h in habits) / len(habits)
-        avg_success_rate = sum(h.success_rate for h in habits) / len(habits)
-        
         return {
-            "total": len(habits),
-            "active": len(active_habits),
-            "avg_streak": round(avg_streak, 2),
-            "avg_success_rate": round(avg_success_rate, 2),
+            "total": total,
+            "active": active,
+            "avg_streak": round(float(avg_streak or 0), 2),
+            "avg_success_rate": round(float(avg_success_rate or 0), 2),
         }
     
     @staticmethod
@@ -130,10 +186,9 @@ class AnalyticsService:
             mood_average=summary_data["mood_average"],
             habit_completion_rate=summary_data["habit_completion_rate"],
             goal_progress=summary_data["goal_progress"],
-            insights=str(summary_data),
+            insights=orjson.dumps(summary_data).decode(),
             period=period,
         )
         db.add(analytics)
         db.commit()
-        db.refresh(analytics)
         return analytics
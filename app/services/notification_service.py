@@ -1,5 +1,8 @@
 from typing import Optional, List, Dict, Any
 from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class NotificationService:
@@ -42,17 +45,13 @@ class NotificationService:
             # - Push notifications (Firebase, OneSignal)
             # - SMS (Twilio)
             # - WebSocket for real-time notifications
-            print(f"Notification sent to user {notification['user_id']}: {notification['title']}")
+            logger.debug("Notification sent to user %s: %s", notification["user_id"], notification["title"])
             return True
         except Exception as e:
-            print(f"Failed to send notification: {str(e)}")
+            logger.error("Failed to send notification: %s", e)
             return False
     
     @staticmethod
     def batch_send_notifications(notifications: List[Dict[str, Any]]) -> int:
         """Send multiple notifications and return count of successful sends."""
-        success_count = 0
-        for notification in notifications:
-            if NotificationService.send_notification(notification):
-                success_count += 1
-        return success_count
+        return sum(map(NotificationService.send_notification, notifications))
@@ -1,8 +1,10 @@
-from datetime import datetime, timedelta
-from typing import Callable, Optional
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import update
 from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
 from app.models.user import Reminder
-import asyncio
+from app.services.notification_service import NotificationService
 
 
 class ReminderService:
@@ -30,7 +32,6 @@ class ReminderService:
         )
         db.add(reminder)
         db.commit()
-        db.refresh(reminder)
         return reminder
     
     @staticmethod
@@ -38,16 +39,43 @@ class ReminderService:
         db: Session,
         reminder_id: int,
         status: str,
+        user_id: Optional[int] = None,
     ) -> Optional[Reminder]:
-        """Update reminder status."""
-        reminder = db.query(Reminder).filter(Reminder.id == reminder_id).first()
+        """
+        Update reminder status with a single UPDATE ... RETURNING.
+        
+        When user_id is given, only a reminder owned by that user is updated.
+        Returns None if no reminder matched.
+        """
+        stmt = update(Reminder).where(Reminder.id == reminder_id)
+        if user_id is not None:
+            stmt = stmt.where(Reminder.user_id == user_id)
+        
+        reminder = db.execute(stmt.values(status=status).returning(Reminder)).scalar_one_or_none()
         if reminder:
-            reminder.status = status
-            reminder.updated_at = datetime.utcnow()
             db.commit()
-            db.refresh(reminder)
         return reminder
     
+    @staticmethod
+    def fire_timer(reminder_id: int) -> None:
+        """
+        Mark a timer's reminder as triggered and send its notification.
+        
+        Runs as a scheduler job outside any request, so it opens its own
+        session. Timers whose reminder was deleted in the meantime are skipped.
+        """
+        with SessionLocal() as db:
+            reminder = ReminderService.update_reminder_status(db, reminder_id, "triggered")
+        
+        if reminder:
+            notification = NotificationService.create_notification(
+                user_id=reminder.user_id,
+                reminder_id=reminder.id,
+                title=reminder.title,
+                message=reminder.message,
+            )
+            NotificationService.send_notification(notification)
+    
     @staticmethod
     def get_pending_reminders(db: Session, user_id: int) -> list:
         """Get all pending reminders for a user."""
@@ -59,35 +87,3 @@ class ReminderService:
             Reminder.is_active == True,
         ).all()
         return reminders
-    
-    @staticmethod
-    async def schedule_timer(
-        duration_seconds: int,
-        callback: Optional[Callable] = None,
-        callback_args: dict = None,
-    ) -> None:
-        """
-        Schedule a timer that triggers a callback after specified duration.
-        
-        Args:
-            duration_seconds: Timer duration in seconds
-            callback: Optional callback function to execute
-            callback_args: Arguments to pass to callback
-        """
-        await asyncio.sleep(duration_seconds)
-        
-        if callback and callable(callback):
-            if callback_args:
-                callback(**callback_args)
-            else:
-                callback()
-    
-    @staticmethod
-    def delete_reminder(db: Session, reminder_id: int) -> bool:
-        """Delete a reminder."""
-        reminder = db.query(Reminder).filter(Reminder.id == reminder_id).first()
-        if reminder:
-            db.delete(reminder)
-            db.commit()
-            return True
-        return False
@@ -1,30 +1,190 @@
-from typing import List, Dict, Any, Optional
+from typing import Dict, Any, MutableMapping, Optional, Tuple, Type, TypeVar
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
-from app.models.user import Mood, Habit, Goal, Analytics
-import base64
+from fastapi import HTTPException, Request, status
+from pydantic import BaseModel
+from sqlalchemy import delete, select, tuple_, update
+from sqlalchemy.orm import Query, Session
+import hashlib
 import re
 import logging
 
 logger = logging.getLogger(__name__)
 
+ModelT = TypeVar("ModelT")
 
-def calculate_mood_average(moods: List[Mood]) -> Optional[str]:
-    """Calculate average mood from a list of moods."""
-    if not moods:
+# Numeric score for each mood type, used when averaging moods
+MOOD_SCORES = {
+    "excellent": 5,
+    "good": 4,
+    "neutral": 3,
+    "sad": 1,
+    "anxious": 2,
+    "angry": 1,
+}
+
+# Insight sentences for generate_insights, keyed by mood average or by the
+# lowest rate (0-1) they apply to; the *_LOW sentence covers everything below
+_MOOD_INSIGHTS = {
+    "excellent": "Your mood has been excellent! Keep up the great work with your mindfulness practices.",
+    "good": "Your mood is good overall. Continue with your current habits to maintain this positive state.",
+    "neutral": "Your mood is neutral. Try increasing your daily mindfulness or physical activity.",
+}
+_MOOD_INSIGHT_LOW = "Your mood needs some attention. Consider adding more relaxation or meditation practices."
+
+_HABIT_INSIGHTS = (
+    (0.8, "Excellent habit completion rate of {:.1f}%! You're staying consistent."),
+    (0.5, "Good habit completion rate of {:.1f}%. Try to be more consistent."),
+)
+_HABIT_INSIGHT_LOW = "Your habit completion is at {:.1f}%. Start small and build momentum."
+
+_GOAL_INSIGHTS = (
+    (0.8, "You're almost there with your goals! Keep pushing forward."),
+    (0.5, "You're making good progress on your goals. Stay focused and consistent."),
+)
+_GOAL_INSIGHT_LOW = "You're in the early stages of your goals. Break them down into smaller milestones."
+
+# Largest accepted profile picture, as a Base64 string (~5 MB decoded)
+MAX_IMAGE_BASE64_LENGTH = 4 * (5 * 1024 * 1024 // 3)
+
+# "data:image/png;base64" and the like, up to the comma
+_DATA_URI_HEADER_RE = re.compile(r"data:image/[^;,]+;base64")
+
+# Base64 alphabet with at most two trailing padding characters
+_BASE64_RE = re.compile(r"[A-Za-z0-9+/]*={0,2}")
+
+
+def get_owned(db: Session, model: Type[ModelT], pk: int, user_id: int) -> Optional[ModelT]:
+    """Fetch a row by primary key if it belongs to the given user.
+
+    Uses Session.get, so rows already in the session's identity map are
+    returned without a query.
+    """
+    obj = db.get(model, pk)
+    if obj is None or obj.user_id != user_id:
         return None
+    return obj
+
+
+def delete_owned(db: Session, model: Type[ModelT], pk: int, user_id: int) -> bool:
+    """Delete a row by primary key if it belongs to the given user.
+
+    Issues a single DELETE scoped to the owner instead of loading the row
+    first. Returns False when nothing matched; the caller commits.
+    """
+    result = db.execute(delete(model).where(model.id == pk, model.user_id == user_id))
+    return result.rowcount > 0
+
+
+def update_owned(
+    db: Session, model: Type[ModelT], pk: int, user_id: int, values: Dict[str, Any]
+) -> Optional[ModelT]:
+    """Apply ``values`` to a row by primary key if it belongs to the given user.
+
+    Issues a single UPDATE ... RETURNING scoped to the owner instead of
+    SELECT, mutate, flush and refresh. An empty patch falls back to
+    get_owned. Returns None when nothing matched; the caller commits.
+    """
+    if not values:
+        return get_owned(db, model, pk, user_id)
+    return db.execute(
+        update(model)
+        .where(model.id == pk, model.user_id == user_id)
+        .values(**values)
+        .returning(model)
+    ).scalar_one_or_none()
+
+
+def response_columns(model: Type[ModelT], schema: Type[BaseModel]) -> list:
+    """Columns of ``model`` named by the fields of ``schema``, in field order.
+
+    Selecting exactly these yields rows that already have the response shape.
+    """
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+def list_etag(db: Session, model: Type[ModelT], user_id: int) -> str:
+    """Weak ETag for a user's rows of a model that has an ``updated_at`` column.
+
+    Hashes every row's ``(id, updated_at)``: inserts and deletes change the
+    set of ids, and every UPDATE changes that row's ``updated_at`` via its
+    onupdate. A count plus ``max(updated_at)`` is not enough, because
+    ``updated_at`` is the writing transaction's start time: a commit can land
+    with a timestamp older than the current maximum. Only these two columns
+    are read, never the full rows.
+    """
+    rows = db.execute(
+        select(model.id, model.updated_at)
+        .where(model.user_id == user_id)
+        .order_by(model.id)
+    )
+    digest = hashlib.blake2b(digest_size=16)
+    count = 0
+    for row_id, updated_at in rows:
+        digest.update(f"{row_id}@{updated_at.isoformat() if updated_at else ''};".encode())
+        count += 1
+    return f'W/"{count}-{digest.hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Return True if the request's If-None-Match header matches the ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return header.strip() == "*" or etag in (tag.strip() for tag in header.split(","))
+
+
+def keyset_page(
+    query: Query,
+    sort_column,
+    limit: int,
+    cursor: Optional[Any],
+    headers: MutableMapping[str, str],
+    id_column=None,
+) -> list:
+    """Return one page of rows, highest ``sort_column`` first, strictly below ``cursor``.
+
+    Seeks on an indexed column instead of using OFFSET, so deep pages cost the
+    same as the first. When the page is full, the last row's sort value is put
+    in the ``X-Next-Cursor`` header for the client to pass as the next
+    ``cursor``.
+
+    For a non-unique ``sort_column`` (timestamps), pass the table's
+    ``id_column`` as a tie-breaker: rows are then ordered and sought on
+    ``(sort_column, id)`` and the cursor is the string ``"<iso timestamp>,<id>"``,
+    so rows sharing a timestamp at a page boundary are not skipped.
+    """
+    if id_column is None:
+        if cursor is not None:
+            query = query.filter(sort_column < cursor)
+        rows = query.order_by(sort_column.desc()).limit(limit).all()
+        if len(rows) == limit:
+            headers["X-Next-Cursor"] = str(getattr(rows[-1], sort_column.key))
+        return rows
     
-    mood_scores = {
-        "excellent": 5,
-        "good": 4,
-        "neutral": 3,
-        "sad": 1,
-        "anxious": 2,
-        "angry": 1,
-    }
+    if cursor is not None:
+        query = query.filter(tuple_(sort_column, id_column) < tuple_(*_parse_cursor(cursor)))
+    rows = query.order_by(sort_column.desc(), id_column.desc()).limit(limit).all()
+    if len(rows) == limit:
+        last = rows[-1]
+        headers["X-Next-Cursor"] = f"{getattr(last, sort_column.key).isoformat()},{getattr(last, id_column.key)}"
+    return rows
+
+
+def _parse_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Split a ``"<iso timestamp>,<id>"`` cursor, rejecting malformed ones with 400."""
+    value, _, row_id = cursor.rpartition(",")
+    try:
+        return datetime.fromisoformat(value), int(row_id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def mood_average_from_score(total_score: float, entries: int) -> Optional[str]:
+    """Calculate average mood from the summed MOOD_SCORES of ``entries`` moods."""
+    if not entries:
+        return None
     
-    total_score = sum(mood_scores.get(mood.mood_type, 0) for mood in moods)
-    avg_score = total_score / len(moods)
+    avg_score = total_score / entries
     
     if avg_score >= 4.5:
         return "excellent"
@@ -36,52 +196,18 @@ def calculate_mood_average(moods: List[Mood]) -> Optional[str]:
         return "sad"
 
 
-def calculate_habit_completion_rate(habits: List[Habit]) -> float:
-    """Calculate habit completion rate."""
-    if not habits:
-        return 0.0
-    
-    total_rate = sum(habit.success_rate for habit in habits)
-    return total_rate / len(habits)
-
-
-def calculate_goal_progress(goals: List[Goal]) -> float:
-    """Calculate overall goal progress."""
-    if not goals:
-        return 0.0
-    
-    total_progress = sum(goal.completion_percentage for goal in goals)
-    return total_progress / len(goals)
-
-
 def generate_insights(mood_avg: str, habit_rate: float, goal_progress: float) -> str:
     """Generate insights based on user data."""
-    insights = []
-    
-    if mood_avg == "excellent":
-        insights.append("Your mood has been excellent! Keep up the great work with your mindfulness practices.")
-    elif mood_avg == "good":
-        insights.append("Your mood is good overall. Continue with your current habits to maintain this positive state.")
-    elif mood_avg == "neutral":
-        insights.append("Your mood is neutral. Try increasing your daily mindfulness or physical activity.")
-    else:
-        insights.append("Your mood needs some attention. Consider adding more relaxation or meditation practices.")
-    
-    if habit_rate >= 0.8:
-        insights.append(f"Excellent habit completion rate of {habit_rate*100:.1f}%! You're staying consistent.")
-    elif habit_rate >= 0.5:
-        insights.append(f"Good habit completion rate of {habit_rate*100:.1f}%. Try to be more consistent.")
-    else:
-        insights.append(f"Your habit completion is at {habit_rate*100:.1f}%. Start small and build momentum.")
-    
-    if goal_progress >= 0.8:
-        insights.append("You're almost there with your goals! Keep pushing forward.")
-    elif goal_progress >= 0.5:
-        insights.append("You're making good progress on your goals. Stay focused and consistent.")
-    else:
-        insights.append("You're in the early stages of your goals. Break them down into smaller milestones.")
-    
-    return " ".join(insights)
+    mood_insight = _MOOD_INSIGHTS.get(mood_avg, _MOOD_INSIGHT_LOW)
+    habit_insight = next(
+        (text for threshold, text in _HABIT_INSIGHTS if habit_rate >= threshold),
+        _HABIT_INSIGHT_LOW,
+    ).format(habit_rate * 100)
+    goal_insight = next(
+        (text for threshold, text in _GOAL_INSIGHTS if goal_progress >= threshold),
+        _GOAL_INSIGHT_LOW,
+    )
+    return f"{mood_insight} {habit_insight} {goal_insight}"
 
 
 def process_base64_image(image_data: Optional[str]) -> Optional[str]:
@@ -100,22 +226,25 @@ def process_base64_image(image_data: Optional[str]) -> Optional[str]:
     try:
         # Remove data URI prefix if present (e.g., "data:image/png;base64,")
         if image_data.startswith('data:'):
-            # Extract just the base64 part
-            match = re.match(r'data:image/[^;]+;base64,(.+)', image_data)
-            if match:
-                image_data = match.group(1)
-            else:
+            # Extract just the base64 part; only the short header goes
+            # through a regex, the payload is sliced off once
+            header, _, payload = image_data.partition(',')
+            if not payload or not _DATA_URI_HEADER_RE.fullmatch(header):
                 logger.warning("Invalid data URI format")
                 return None
+            image_data = payload
         
         # Remove any whitespace
         image_data = image_data.strip()
         
-        # Validate Base64 encoding by attempting to decode
-        try:
-            base64.b64decode(image_data, validate=True)
-        except Exception as e:
-            logger.error(f"Invalid Base64 encoding: {e}")
+        if len(image_data) > MAX_IMAGE_BASE64_LENGTH:
+            logger.warning("Base64 image exceeds the size limit")
+            return None
+        
+        # Validate canonical (padded) Base64 without decoding it: the decoded
+        # bytes were never used, only allocated
+        if len(image_data) % 4 or not _BASE64_RE.fullmatch(image_data):
+            logger.error("Invalid Base64 encoding")
             return None
         
         # Return the cleaned Base64 string (store with data URI for consistency)
@@ -123,5 +252,5 @@ def process_base64_image(image_data: Optional[str]) -> Optional[str]:
         return f"data:image/jpeg;base64,{image_data}"
         
     except Exception as e:
-        logger.error(f"Error processing Base64 image: {e}")
+        logger.error("Error processing Base64 image: %s", e)
         return None